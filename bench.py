@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""Throughput benchmark for FTP Login Destroyer against a local fake FTP server farm.
+
+The farm answers on loopback addresses (127.2.x.y), each with one fixed
+behaviour, so runs never touch real hosts and are repeatable. The scan is
+the real FTPDestroyer pipeline; the benchmark reports targets/sec,
+per-phase latency, peak RSS and the startup time of a single-host check,
+can save them as JSON and compare a run against an earlier one to catch
+regressions before a release.
+"""
+
+import argparse
+import asyncio
+import ipaddress
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from rich.table import Table
+
+from main import FTPDestroyer, ConcurrencyController, console
+
+# Endpoint behaviours, in the order addresses are handed out
+BEHAVIOURS = ("anonymous", "denied", "slow", "blackhole", "closed", "listing")
+
+FARM_NETWORK = ipaddress.IPv4Address("127.2.0.1")
+
+def build_plan(counts):
+    """Map farm addresses to behaviours: {address: behaviour}."""
+    plan = {}
+    address = FARM_NETWORK
+    for behaviour in BEHAVIOURS:
+        for _ in range(counts[behaviour]):
+            plan[str(address)] = behaviour
+            address += 1
+    return plan
+
+class FakeFTPFarm:
+    """asyncio FTP server whose behaviour depends on the local address a client dialled.
+
+    One wildcard listener serves every farm address; connections to any
+    other address are dropped. "closed" endpoints are scanned on the next
+    port up, where nothing listens, so they are refused by the kernel.
+    "blackhole" endpoints accept and never speak (loopback cannot drop
+    SYNs without firewall rules).
+    """
+
+    def __init__(self, plan, port, banner_delay=0.5, listing_lines=5000):
+        self.plan = plan
+        self.port = port
+        self.banner_delay = banner_delay
+        self.listing_lines = listing_lines
+
+    async def handle(self, reader, writer):
+        behaviour = self.plan.get(writer.get_extra_info("sockname")[0])
+        try:
+            if behaviour is None:
+                writer.transport.abort()
+                return
+            if behaviour == "blackhole":
+                await reader.read()
+                return
+            if behaviour == "slow":
+                await asyncio.sleep(self.banner_delay)
+            writer.write(b"220 Benchmark FTP ready\r\n")
+            await self.commands(reader, writer, behaviour)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def commands(self, reader, writer, behaviour):
+        data_server = None
+        while line := await reader.readline():
+            command = line.decode("latin-1").strip().split(" ")[0].upper()
+            if command == "USER":
+                reply = "331 Password required"
+            elif command == "PASS":
+                reply = "530 Login incorrect." if behaviour == "denied" else "230 Login successful."
+            elif command == "PWD":
+                reply = '257 "/" is the current directory'
+            elif command == "SYST":
+                reply = "215 UNIX Type: L8"
+            elif command == "TYPE":
+                reply = "200 Switching to ASCII mode."
+            elif command == "PASV":
+                lines = self.listing_lines if behaviour == "listing" else 3
+                host = writer.get_extra_info("sockname")[0]
+                data_server = await asyncio.start_server(
+                    lambda r, w: self.listing(w, lines), host, 0
+                )
+                port = data_server.sockets[0].getsockname()[1]
+                reply = f"227 Entering Passive Mode ({host.replace('.', ',')},{port // 256},{port % 256})"
+            elif command == "LIST":
+                writer.write(b"150 Here comes the directory listing.\r\n")
+                await writer.drain()
+                await asyncio.sleep(0.01)
+                reply = "226 Directory send OK."
+            elif command == "QUIT":
+                writer.write(b"221 Goodbye.\r\n")
+                break
+            else:
+                reply = "502 Command not implemented."
+            writer.write((reply + "\r\n").encode())
+            await writer.drain()
+        if data_server is not None:
+            data_server.close()
+
+    async def listing(self, writer, lines):
+        try:
+            for i in range(lines):
+                if writer.is_closing():
+                    break  # the scanner hung up after the lines it wanted
+                writer.write(b"-rw-r--r--    1 ftp      ftp          1024 Jan 01 00:00 file%06d.bin\r\n" % i)
+                if i % 512 == 511:
+                    await writer.drain()
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, ready):
+        server = await asyncio.start_server(self.handle, "0.0.0.0", self.port, backlog=4096)
+        ready.set()
+        async with server:
+            await server.serve_forever()
+
+def run_farm(plan, port, banner_delay, listing_lines, ready):
+    """Entry point of the farm process."""
+    try:
+        asyncio.run(FakeFTPFarm(plan, port, banner_delay, listing_lines).serve(ready))
+    except KeyboardInterrupt:
+        pass
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def measure_startup(port, runs):
+    """Median wall time in ms of a whole single-host `--json` check that is refused at once.
+
+    That is almost all interpreter start, imports and teardown: the cost a
+    scheduled one-host check pays on every run. The first run warms the
+    bytecode cache and is not counted.
+    """
+    command = [sys.executable, "-m", "main", "-t", f"{FARM_NETWORK}:{port + 1}", "--json"]
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    times = []
+    for _ in range(runs + 1):
+        started = time.perf_counter()
+        subprocess.run(command, cwd=cwd, stdout=subprocess.DEVNULL, check=True)
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times[1:])
+
+def run_benchmark(args):
+    """Start the farm, scan it once and return the result dict."""
+    counts = {behaviour: getattr(args, behaviour) for behaviour in BEHAVIOURS}
+    plan = build_plan(counts)
+    targets = [
+        f"{address}:{args.port + 1 if behaviour == 'closed' else args.port}"
+        for address, behaviour in plan.items()
+    ]
+    random.Random(args.seed).shuffle(targets)
+
+    context = multiprocessing.get_context("spawn")
+    ready = context.Event()
+    farm = context.Process(
+        target=run_farm, args=(plan, args.port, args.banner_delay, args.listing_lines, ready), daemon=True
+    )
+    farm.start()
+    try:
+        while not ready.wait(0.1):
+            if not farm.is_alive():
+                raise RuntimeError(f"fake FTP farm did not start on port {args.port} (is it in use?)")
+        with tempfile.TemporaryDirectory() as workdir:
+            destroyer = FTPDestroyer(
+                timeout=args.timeout,
+                max_workers=args.workers,
+                output_file=os.path.join(workdir, "vuln.txt"),
+                engine=args.engine,
+                processes=args.processes,
+                headless=True,
+                controller=ConcurrencyController(args.workers, cooldown=args.timeout)
+            )
+            started = time.perf_counter()
+            destroyer.process_targets(targets)
+            elapsed = time.perf_counter() - started
+            destroyer.close()
+    finally:
+        farm.terminate()
+        farm.join()
+
+    return {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "scenario": {
+            "counts": counts,
+            "engine": args.engine,
+            "processes": args.processes,
+            "workers": args.workers,
+            "timeout": args.timeout,
+            "banner_delay": args.banner_delay,
+            "listing_lines": args.listing_lines,
+        },
+        "targets": len(targets),
+        "success": destroyer.stats["success"],
+        # Slow endpoints allow anonymous login once their banner arrives
+        "expected_success": counts["anonymous"] + counts["listing"]
+                            + (counts["slow"] if args.banner_delay < args.timeout else 0),
+        "seconds": elapsed,
+        "targets_per_sec": len(targets) / elapsed,
+        # ru_maxrss is KiB on Linux and bytes on macOS; worker processes are not included
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1 << 20 if sys.platform == "darwin" else 1 << 10),
+        "phases": {
+            name: {"p50": p50, "p95": p95, "p99": p99}
+            for name, p50, p95, p99 in destroyer.phase_percentiles()
+        },
+        "startup_ms": measure_startup(args.port, args.startup_runs) if args.startup_runs else None,
+    }
+
+def print_result(result, baseline=None):
+    table = Table(title=f"Benchmark ({result['revision'] or 'unknown revision'})", header_style="bold cyan")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right", style="green")
+    if baseline:
+        table.add_column("Baseline", justify="right", style="bright_black")
+        table.add_column("Change", justify="right")
+
+    def row(label, value, old=None, fmt="{:.1f}", higher_is_better=True):
+        cells = [label, fmt.format(value)]
+        if baseline:
+            if old is None:
+                cells += ["-", "-"]
+            else:
+                change = (value - old) / old * 100 if old else 0.0
+                better = change >= 0 if higher_is_better else change <= 0
+                cells += [fmt.format(old), f"[{'green' if better else 'red'}]{change:+.1f}%[/]"]
+        table.add_row(*cells)
+
+    old = baseline or {}
+    row("Targets", result["targets"], old.get("targets"), "{}")
+    row("Successful", result["success"], old.get("success"), "{}")
+    row("Duration (s)", result["seconds"], old.get("seconds"), "{:.2f}", False)
+    row("Targets/sec", result["targets_per_sec"], old.get("targets_per_sec"))
+    row("Peak RSS (MiB)", result["peak_rss_mb"], old.get("peak_rss_mb"), higher_is_better=False)
+    if result["startup_ms"] is not None:
+        row("Startup (ms)", result["startup_ms"], old.get("startup_ms"), higher_is_better=False)
+    for name, values in result["phases"].items():
+        old_phase = old.get("phases", {}).get(name, {})
+        row(f"{name} p50 (ms)", values["p50"], old_phase.get("p50"), higher_is_better=False)
+        row(f"{name} p95 (ms)", values["p95"], old_phase.get("p95"), higher_is_better=False)
+        row(f"{name} p99 (ms)", values["p99"], old_phase.get("p99"), higher_is_better=False)
+    console.print(table)
+
+def regressions(result, baseline, tolerance):
+    """Return human-readable regressions beyond `tolerance` (a fraction)."""
+    found = []
+    if result["targets_per_sec"] < baseline["targets_per_sec"] * (1 - tolerance):
+        found.append(f"targets/sec {baseline['targets_per_sec']:.1f} -> {result['targets_per_sec']:.1f}")
+    if result["peak_rss_mb"] > baseline["peak_rss_mb"] * (1 + tolerance):
+        found.append(f"peak RSS {baseline['peak_rss_mb']:.1f} -> {result['peak_rss_mb']:.1f} MiB")
+    if result["startup_ms"] and baseline.get("startup_ms") and result["startup_ms"] > baseline["startup_ms"] * (1 + tolerance):
+        found.append(f"startup {baseline['startup_ms']:.0f} -> {result['startup_ms']:.0f} ms")
+    return found
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FTP Login Destroyer against a local fake FTP farm")
+    parser.add_argument("--anonymous", type=int, default=200, help="Endpoints allowing anonymous login (default: 200)")
+    parser.add_argument("--denied", type=int, default=200, help="Endpoints refusing anonymous login (default: 200)")
+    parser.add_argument("--slow", type=int, default=50, help="Endpoints with a delayed banner (default: 50)")
+    parser.add_argument("--blackhole", type=int, default=50, help="Endpoints that accept and never answer (default: 50)")
+    parser.add_argument("--closed", type=int, default=500, help="Endpoints whose port is closed (default: 500)")
+    parser.add_argument("--listing", type=int, default=20,
+                        help="Anonymous endpoints with a large directory listing (default: 20)")
+    parser.add_argument("--banner-delay", type=float, default=0.5, help="Banner delay of slow endpoints (default: 0.5)")
+    parser.add_argument("--listing-lines", type=int, default=5000, help="Lines in a large listing (default: 5000)")
+    parser.add_argument("--port", type=int, default=2121, help="Port the farm listens on (default: 2121)")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the target order (default: 1)")
+    parser.add_argument("-w", "--workers", type=int, default=100, help="Concurrent probes (default: 100)")
+    parser.add_argument("--timeout", type=float, default=1.0, help="Scanner timeout in seconds (default: 1)")
+    parser.add_argument("--engine", choices=["thread", "async"], default="thread", help="Probe engine (default: thread)")
+    parser.add_argument("--processes", type=int, default=1, help="Scanner worker processes (default: 1)")
+    parser.add_argument("--startup-runs", type=int, default=10,
+                        help="Single-host --json runs timed for the startup figure; 0 skips it (default: 10)")
+    parser.add_argument("--json", metavar="PATH", help="Save the result as JSON")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare with a result saved by --json")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Allowed throughput/RSS/startup regression against --compare before failing (default: 0.10)")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+
+    result = run_benchmark(args)
+    print_result(result, baseline)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if result["success"] != result["expected_success"]:
+        console.print(f"[red]Expected {result['expected_success']} successful logins, got {result['success']}[/red]")
+        sys.exit(1)
+    if baseline:
+        if baseline.get("scenario") != result["scenario"]:
+            console.print("[yellow]Baseline was recorded with a different scenario; numbers are not comparable.[/yellow]")
+        found = regressions(result, baseline, args.tolerance)
+        if found:
+            console.print(f"[red]Regression beyond {args.tolerance:.0%}: {'; '.join(found)}[/red]")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,63 +1,1472 @@
 #!/usr/bin/env python3
 
 import argparse
+import asyncio
+import csv
+import errno
+import gzip
+import hashlib
+import heapq
+import ipaddress
+import json
 import socket
 import time
 import threading
 import logging
+import math
 import sys
 import os
-from ftplib import FTP
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from rich.console import Console
-from rich.progress import (
-    Progress,
-    SpinnerColumn,
-    BarColumn,
-    TextColumn,
-    TimeElapsedColumn,
-    TimeRemainingColumn,
-    MofNCompleteColumn
-)
-from rich.panel import Panel
-from rich.table import Table
-from rich.traceback import install
-from rich.logging import RichHandler
-from rich import print as rprint
-from rich.layout import Layout
-from rich.live import Live
-from rich.tree import Tree
-from rich.syntax import Syntax
-from rich.align import Align
+import queue
+import multiprocessing
+import sqlite3
+from ftplib import FTP, error_temp, error_perm, error_reply, error_proto, parse227, parse257
+from array import array
+from html import escape
+from bisect import bisect_left
+from collections import Counter, OrderedDict, deque
+from contextlib import contextmanager, nullcontext
+from functools import partial
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from rich.prompt import Prompt
-from rich.style import Style
-from rich.text import Text
-from rich.box import HEAVY, ROUNDED
 
-# Install rich traceback handler
-install(show_locals=True)
+# Rich is imported on first use (the dashboard, tables, console.print), so
+# headless --json runs start without it.
 
-# Initialize rich console
-console = Console()
+class LazyConsole:
+    """Stand-in for a rich Console that creates it on first use."""
 
-# Configure logging with rich handler
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(message)s",
-    handlers=[RichHandler(rich_tracebacks=True, markup=True)]
-)
+    def __init__(self, **options):
+        self.options = options
+        self._console = None
+
+    def get(self):
+        """Return the real Console, creating it if needed."""
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console(**self.options)
+        return self._console
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+console = LazyConsole()
 
 logger = logging.getLogger("ftp_destroyer")
 
+def setup_logging(plain=False):
+    """Log through Rich with Rich tracebacks, or as plain lines on stderr."""
+    if plain:
+        logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s", stream=sys.stderr)
+        return
+    from rich.logging import RichHandler
+    from rich.traceback import install
+    install(show_locals=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(message)s",
+        handlers=[RichHandler(rich_tracebacks=True, markup=True)]
+    )
+
+# Fixed redraw rate of the live dashboard, independent of result throughput
+DASHBOARD_FPS = 4
+
+# Probe outcomes that are reported separately from free-form errors
+PORT_CLOSED = "Port {port} closed"
+NO_ANSWER = "No answer on port {port}"
+UNREACHABLE = "Host unreachable"
+PREFIX_UNREACHABLE = "Skipped: prefix unreachable"
+NO_BANNER = "No FTP banner"
+LOGIN_REFUSED = "Login refused"
+DNS_FAILED = "DNS lookup failed"
+DEADLINE_EXCEEDED = "Host deadline exceeded"
+LOCAL_ERROR = "Scanner resource error"
+NO_WORKER = "No worker covers address"
+
+# Connect errors that fail fast because no route leads to the host
+UNREACHABLE_ERRNOS = {errno.EHOSTUNREACH, errno.ENETUNREACH, errno.EHOSTDOWN, errno.ENETDOWN}
+
+# Connect errors caused by the scanner's own limits (file descriptors,
+# ephemeral ports, buffers) rather than the host; retried with back-off
+LOCAL_ERRNOS = {errno.EMFILE, errno.ENFILE, errno.EADDRNOTAVAIL, errno.ENOBUFS}
+LOCAL_RETRIES = 5
+LOCAL_BACKOFF = 0.05
+
+# Probe phases timed into per-phase latency histograms, in pipeline order
+PHASES = ("dns", "connect", "banner", "login", "info", "listing")
+
+# Failures while reading the welcome line mean no FTP service answered
+BANNER_ERRORS = (OSError, EOFError, error_proto, UnicodeDecodeError)
+REPLY_ERRORS = (error_perm, error_temp, error_reply)
+LOGIN_ERRORS = REPLY_ERRORS
+
+# Open files budgeted per worker (control and data connection, plus a
+# logged-in session waiting for enrichment) and for everything else
+FDS_PER_WORKER = 3
+FD_RESERVE = 32
+
+# Hosts per page of the HTML report's per-host detail
+REPORT_PAGE_SIZE = 500
+
+REPORT_STYLE = """
+        body { font-family: Arial, sans-serif; margin: 20px; background-color: #f0f0f0; }
+        .success { color: green; }
+        .fail { color: red; }
+        .container { margin: 20px 0; padding: 20px; border-radius: 5px; background-color: white; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }
+        .stats { display: flex; justify-content: space-around; flex-wrap: wrap; }
+        .stat-box {
+            padding: 20px;
+            margin: 10px;
+            min-width: 200px;
+            border-radius: 5px;
+            background-color: white;
+            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
+            text-align: center;
+        }
+        .target-info {
+            border-left: 4px solid;
+            padding: 10px;
+            margin: 10px 0;
+        }
+        .success-info { border-color: green; }
+        .fail-info { border-color: red; }
+        pre { background: #f5f5f5; padding: 10px; border-radius: 4px; }
+        table { border-collapse: collapse; }
+        th, td { padding: 6px 14px; text-align: right; border-bottom: 1px solid #ddd; }
+        th:first-child, td:first-child { text-align: left; }
+"""
+
+# How far a probe goes after a successful anonymous login
+PROBE_DEPTHS = ("login", "info", "listing")
+
+FTP_PORT = 21
+
+# Marks enrichment jobs among a dispatcher's pending probes; they hold no
+# controller slot
+ENRICHMENT = object()
+
+def host_digest(host):
+    """Return a 64-bit digest of a host, used for compact membership sets."""
+    return int.from_bytes(hashlib.blake2b(host.encode(), digest_size=8).digest(), "big")
+
+def parse_features(resp):
+    """Return the feature lines of a multi-line FEAT reply."""
+    return [line.strip() for line in resp.splitlines()[1:-1] if line.strip()]
+
+def error_category(error):
+    """Coarse category of a failure's error text, for summaries."""
+    if error.startswith(LOGIN_REFUSED):
+        return LOGIN_REFUSED
+    if error.startswith("Port ") and error.endswith(" closed"):
+        return "Port closed"
+    if error.startswith("No answer on port "):
+        return "No answer"
+    if error in (NO_BANNER, DNS_FAILED, DEADLINE_EXCEEDED, UNREACHABLE, PREFIX_UNREACHABLE, NO_WORKER):
+        return error
+    if error.startswith(LOCAL_ERROR):
+        return LOCAL_ERROR
+    if "timed out" in error:
+        return "Timed out"
+    if error.startswith("[Errno"):
+        return error.split("] ", 1)[-1]
+    if error[:3].isdigit():
+        return f"FTP {error[:3]} reply"
+    return "Other error"
+
+def is_outcome(record):
+    """False for failures that say nothing about the host itself: a prefix skip, a scanner
+    resource error or a job no worker node could take."""
+    error = record.error
+    return error is None or not (error in (PREFIX_UNREACHABLE, NO_WORKER) or error.startswith(LOCAL_ERROR))
+
+def report_head(title):
+    """Opening of a report page, up to and including <body>."""
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>{escape(title)}</title>
+    <style>{REPORT_STYLE}</style>
+</head>
+<body>
+"""
+
+def split_target(target):
+    """Split a canonical target into (host, port); IPv6 literals may use [addr]:port."""
+    if target.startswith("["):
+        host, _, rest = target[1:].partition("]")
+        return host, int(rest[1:]) if rest.startswith(":") else FTP_PORT
+    if target.count(":") == 1:
+        host, port = target.split(":")
+        return host, int(port)
+    return target, FTP_PORT
+
+def join_target(host, port):
+    """Inverse of split_target; the default FTP port is left implicit."""
+    if port == FTP_PORT:
+        return host
+    return f"[{host}]:{port}" if ":" in host else f"{host}:{port}"
+
+def canonicalize_target(target):
+    """Reduce a target to a canonical host or host:port string, or None if unusable.
+
+    Schemes, credentials, paths, trailing dots, letter case and an explicit
+    default port are all dropped, so "FTP://user@Host.example.:21/pub" and
+    "host.example" name the same target.
+    """
+    target = target.strip().lower()
+    if "://" in target:
+        target = target.split("://", 1)[1]
+    target = target.split("/", 1)[0].rpartition("@")[2]
+    if not target:
+        return None
+    try:
+        host, port = split_target(target)
+    except ValueError:
+        return None
+    host = host.rstrip(".")
+    if not host or not 0 < port < 65536:
+        return None
+    if ":" in host:
+        try:
+            host = ipaddress.IPv6Address(host).compressed
+        except ValueError:
+            return None
+    return join_target(host, port)
+
+def expand_target(line):
+    """Lazily expand one inventory line into canonical targets.
+
+    Besides plain hosts, owned address space may be listed as a CIDR block
+    (10.0.0.0/24) or an IPv4 range (10.0.0.1-10.0.0.50 or 10.0.0.1-50);
+    addresses are generated on demand rather than materialized.
+    """
+    line = line.split("#", 1)[0].strip()
+    if not line:
+        return
+    if "://" not in line and "/" in line:
+        try:
+            network = ipaddress.ip_network(line, strict=False)
+        except ValueError:
+            pass
+        else:
+            hosts = network.hosts() if network.num_addresses > 2 else iter(network)
+            for address in hosts:
+                yield str(address)
+            return
+    if "-" in line:
+        start, _, end = line.partition("-")
+        try:
+            first = ipaddress.IPv4Address(start.strip())
+            end = end.strip()
+            last = ipaddress.IPv4Address(end if "." in end else f"{start.rsplit('.', 1)[0]}.{end}")
+        except ValueError:
+            pass
+        else:
+            for value in range(int(first), int(last) + 1):
+                yield str(ipaddress.IPv4Address(value))
+            return
+    target = canonicalize_target(line)
+    if target:
+        yield target
+
+class DigestSet:
+    """Compact set of strings stored as 64-bit digests in an open-addressing array.
+
+    Costs about 16 bytes per member (8-byte slots kept at most half full),
+    versus well over 100 bytes for a set of host strings.
+    """
+
+    def __init__(self, capacity=1 << 16):
+        self._slots = array("Q", bytes(8 * capacity))
+        self._mask = capacity - 1
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def add(self, value):
+        """Add value; return False if it was already present."""
+        key = host_digest(value) or 1  # zero marks an empty slot
+        slots, mask = self._slots, self._mask
+        i = key & mask
+        while slots[i]:
+            if slots[i] == key:
+                return False
+            i = (i + 1) & mask
+        slots[i] = key
+        self._len += 1
+        if self._len * 2 > len(slots):
+            self._grow()
+        return True
+
+    def _grow(self):
+        old = self._slots
+        self._slots = array("Q", bytes(16 * len(old)))
+        self._mask = len(self._slots) - 1
+        for key in old:
+            if key:
+                i = key & self._mask
+                while self._slots[i]:
+                    i = (i + 1) & self._mask
+                self._slots[i] = key
+
+class DigestMap:
+    """Map from strings to 32-bit codes, stored like DigestSet.
+
+    Costs about 24 bytes per entry (12-byte slots kept at most half full).
+    """
+
+    def __init__(self, capacity=1 << 10):
+        self._keys = array("Q", bytes(8 * capacity))
+        self._codes = array("I", bytes(4 * capacity))
+        self._mask = capacity - 1
+        self.len = 0
+
+    def _slot(self, key):
+        keys, mask = self._keys, self._mask
+        i = key & mask
+        while keys[i] and keys[i] != key:
+            i = (i + 1) & mask
+        return i
+
+    def get(self, value, default=None):
+        i = self._slot(host_digest(value) or 1)
+        return self._codes[i] if self._keys[i] else default
+
+    def set(self, value, code):
+        key = host_digest(value) or 1  # zero marks an empty slot
+        i = self._slot(key)
+        if not self._keys[i]:
+            self._keys[i] = key
+            self.len += 1
+        self._codes[i] = code
+        if self.len * 2 > len(self._keys):
+            self._grow()
+
+    def _grow(self):
+        keys, codes = self._keys, self._codes
+        self._keys = array("Q", bytes(16 * len(keys)))
+        self._codes = array("I", bytes(8 * len(codes)))
+        self._mask = len(self._keys) - 1
+        for key, code in zip(keys, codes):
+            if key:
+                i = self._slot(key)
+                self._keys[i] = key
+                self._codes[i] = code
+
+class OutcomeCache:
+    """Outcomes of recently probed endpoints, for other hostnames sharing them.
+
+    A failure is kept as the code of its interned error text in a
+    DigestMap; a hit keeps its record. Two generations of up to maxsize
+    endpoints are kept, and the older one is dropped whole when the newer
+    fills up. Callers serialize access.
+    """
+
+    # Distinct error texts remembered; past this, failures cache their category
+    max_errors = 1 << 16
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._errors = [None]  # code -> error text; code 0 marks a hit
+        self._error_codes = {}
+        self._generations = [(DigestMap(), {})]
+
+    def get(self, key):
+        """Return the hit's ScanRecord or the failure's error text for an (address, port) key, else None."""
+        endpoint = join_target(*key)
+        for codes, hits in self._generations:
+            code = codes.get(endpoint)
+            if code is not None:
+                return hits.get(endpoint) if code == 0 else self._errors[code]
+        return None
+
+    def set(self, key, record):
+        endpoint = join_target(*key)
+        codes, hits = self._generations[0]
+        if codes.len >= self.maxsize and codes.get(endpoint) is None:
+            codes, hits = DigestMap(), {}
+            self._generations = [(codes, hits), self._generations[0]]
+        if record.error is None:
+            hits[endpoint] = record
+            codes.set(endpoint, 0)
+        else:
+            codes.set(endpoint, self._error_code(record.error))
+
+    def _error_code(self, error):
+        code = self._error_codes.get(error)
+        if code is None:
+            if len(self._errors) >= self.max_errors:
+                error = error_category(error)
+                code = self._error_codes.get(error)
+            if code is None:
+                code = self._error_codes[error] = len(self._errors)
+                self._errors.append(error)
+        return code
+
+class TargetIndex:
+    """Canonicalizes, expands and de-duplicates targets as they stream in."""
+
+    def __init__(self):
+        self.seen = DigestSet()
+        self.duplicates = 0
+        self.invalid = 0
+
+    def iter(self, lines):
+        """Lazily yield each canonical target once from an iterable of lines (file or stdin)."""
+        for line in lines:
+            produced = False
+            for target in expand_target(line):
+                produced = True
+                if self.seen.add(target):
+                    yield target
+                else:
+                    self.duplicates += 1
+            if not produced and line.split("#", 1)[0].strip():
+                self.invalid += 1
+                logger.debug(f"Skipping unusable target line: {line.strip()}")
+
+# Sentinel for cache misses, since None is a valid cached value
+_MISSING = object()
+
+class TTLCache:
+    """Thread-safe LRU mapping whose entries optionally expire after ttl seconds."""
+
+    def __init__(self, maxsize, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires = entry
+            if expires is not None and expires < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram (~10% resolution) with cheap percentile queries.
+
+    Buckets grow geometrically from 100us to roughly 10 minutes, so recording
+    a sample is one log() and one list increment regardless of run length.
+    """
+
+    floor = 1e-4
+    ratio = 1.1
+    buckets = 170
+
+    def __init__(self):
+        self.counts = [0] * self.buckets
+        self.count = 0
+        self.max = 0.0
+        self._log_ratio = math.log(self.ratio)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        if seconds <= self.floor:
+            index = 0
+        else:
+            index = min(int(math.log(seconds / self.floor) / self._log_ratio) + 1, self.buckets - 1)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, p):
+        """Return the upper bound (seconds) of the bucket holding the p-th percentile."""
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * p / 100)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.floor * self.ratio ** index, self.max)
+        return self.max
+
+class ThroughputMeter:
+    """Completions per second over a sliding window of one-second buckets."""
+
+    def __init__(self, window=10):
+        self.window = window
+        self.started = time.monotonic()
+        self.buckets = deque()
+
+    def add(self, count=1):
+        second = int(time.monotonic())
+        if self.buckets and self.buckets[-1][0] == second:
+            self.buckets[-1][1] += count
+        else:
+            self.buckets.append([second, count])
+            while self.buckets[0][0] <= second - self.window:
+                self.buckets.popleft()
+
+    def rate(self):
+        now = time.monotonic()
+        cutoff = now - self.window
+        recent = sum(count for second, count in list(self.buckets) if second + 1 > cutoff)
+        span = min(self.window, now - self.started)
+        return recent / span if span > 0 else 0.0
+
+class ConcurrencyController:
+    """Decides how many probes may be in flight, globally and per subnet.
+
+    With adaptive=True the global limit follows AIMD: it grows by one per
+    completion (slow start) until the first congestion signal, then by one
+    per window of `limit` completions, and shrinks multiplicatively when
+    congestion is seen. Congestion is a rise in the short-term timeout rate
+    above the run's long-term rate (dead hosts time out at a steady rate,
+    dropped SYNs from an overloaded firewall or NAT do not), or connect
+    latency climbing well above the best level seen so far.
+
+    Targets whose subnet is at its cap wait in per-subnet queues so other
+    subnets keep flowing. Sorted input (such as an expanded CIDR block)
+    fills those queues a whole /24 at a time, so with a subnet cap the
+    dispatcher reads ahead far enough to have maximum / subnet_cap subnets
+    waiting. The controller is only used from the dispatching thread (or
+    event loop), so it needs no locking.
+    """
+
+    warmup = 100
+    decrease = 0.7
+    timeout_tolerance = 0.15
+    latency_factor = 4.0
+    latency_floor = 0.02
+
+    def __init__(self, limit, maximum=None, adaptive=False, subnet_cap=None,
+                 minimum=1, cooldown=3.0, backlog=1024):
+        self.maximum = maximum or limit
+        self.minimum = minimum
+        self.limit = float(min(limit, self.maximum))
+        self.adaptive = adaptive
+        self.subnet_cap = subnet_cap
+        self.cooldown = cooldown
+        if subnet_cap:
+            backlog = max(backlog, 256 * math.ceil(self.maximum / subnet_cap))
+        self.lookahead = backlog
+        self.in_flight = 0
+        self.queued = 0
+        self.per_subnet = {}
+        self.waiting = OrderedDict()
+        self.slow_start = True
+        self.samples = 0
+        self.timeout_short = self.timeout_long = 0.0
+        self.latency = None
+        self.base_latency = None
+        self.last_decrease = 0.0
+
+    @staticmethod
+    def subnet(address):
+        """Group addresses by /24 (IPv4) or /64 (IPv6) for per-subnet caps."""
+        if ":" in address:
+            return str(ipaddress.IPv6Network(f"{address}/64", strict=False))
+        return address.rsplit(".", 1)[0]
+
+    def submit(self, item, subnet):
+        """Queue a probe; it is started by a later call to ready()."""
+        self.waiting.setdefault(subnet, deque()).append(item)
+        self.queued += 1
+
+    def ready(self):
+        """Pop and mark started every queued probe that fits the current limits."""
+        started = []
+        for subnet in list(self.waiting):
+            items = self.waiting[subnet]
+            while items and self.in_flight < int(self.limit):
+                if self.subnet_cap and self.per_subnet.get(subnet, 0) >= self.subnet_cap:
+                    break
+                started.append((items.popleft(), subnet))
+                self.in_flight += 1
+                self.queued -= 1
+                self.per_subnet[subnet] = self.per_subnet.get(subnet, 0) + 1
+            if not items:
+                del self.waiting[subnet]
+            if self.in_flight >= int(self.limit):
+                break
+        return started
+
+    def must_wait(self):
+        """True when the dispatcher should collect results before reading more targets."""
+        return self.queued and (self.in_flight >= int(self.limit) or self.queued >= self.lookahead)
+
+    def finish(self, subnet, trace):
+        """Release a finished probe's slot and adapt the limit to its outcome."""
+        self.in_flight -= 1
+        remaining = self.per_subnet.get(subnet, 1) - 1
+        if remaining:
+            self.per_subnet[subnet] = remaining
+        else:
+            self.per_subnet.pop(subnet, None)
+        if not self.adaptive or trace is None:
+            return
+
+        # EWMAs start as plain running means so early samples are not biased
+        timed_out = 1.0 if trace.get("timed_out") else 0.0
+        self.samples += 1
+        self.timeout_short += max(0.02, 1 / self.samples) * (timed_out - self.timeout_short)
+        self.timeout_long += max(0.002, 1 / self.samples) * (timed_out - self.timeout_long)
+        connect = trace.get("connect")
+        if connect is not None and not timed_out:
+            self.latency = connect if self.latency is None else self.latency + 0.1 * (connect - self.latency)
+            self.base_latency = self.latency if self.base_latency is None else min(self.base_latency, self.latency)
+        if self.samples < self.warmup:
+            return
+
+        congested = self.timeout_short > self.timeout_long + self.timeout_tolerance
+        if self.latency is not None and self.latency > self.latency_floor:
+            congested = congested or self.latency > self.latency_factor * self.base_latency
+        if congested:
+            now = time.monotonic()
+            if now - self.last_decrease >= self.cooldown:
+                self.limit = max(self.minimum, self.limit * self.decrease)
+                self.slow_start = False
+                self.last_decrease = now
+        elif self.slow_start:
+            self.limit = min(self.maximum, self.limit + 1)
+        else:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+class PrefixHealth:
+    """Negative cache of /24 (IPv4) or /64 (IPv6) prefixes whose hosts never answer.
+
+    A prefix is presumed unreachable after `threshold` connects in a row
+    time out silently, with no answer of any kind (a refusal, an
+    unreachable error, a banner) in between. Of its remaining hosts only
+    one in `sample` is probed; an answer to one brings the prefix back.
+    Used from the dispatcher only, so it needs no lock.
+    """
+
+    def __init__(self, threshold, sample=16):
+        self.threshold = threshold
+        self.sample = sample
+        # prefix -> silent connects in a row; answering prefixes are dropped
+        self.silent = {}
+        # unreachable prefix -> hosts skipped since its last sample probe
+        self.skipped = {}
+
+    def skip(self, prefix):
+        """True when a host in the prefix should be recorded as skipped instead of probed."""
+        if self.silent.get(prefix, 0) < self.threshold:
+            return False
+        skipped = self.skipped.get(prefix, 0) + 1
+        if skipped >= self.sample:
+            self.skipped[prefix] = 0
+            return False
+        self.skipped[prefix] = skipped
+        return True
+
+    def finish(self, prefix, trace):
+        """Count a finished probe's connect as silent or as an answer from the prefix."""
+        if trace.get("silent"):
+            self.silent[prefix] = self.silent.get(prefix, 0) + 1
+        else:
+            self.silent.pop(prefix, None)
+            self.skipped.pop(prefix, None)
+
+class Resolver:
+    """DNS stage that resolves targets ahead of the probe stage.
+
+    Lookups run in a small thread pool up to `lookahead` targets ahead of
+    the probes and are cached (including failures) for `ttl` seconds. An
+    optional hosts file pins names to addresses without touching DNS.
+    """
+
+    def __init__(self, ttl=300, workers=16, lookahead=256, hosts_file=None, max_entries=100000):
+        self.workers = workers
+        self.lookahead = lookahead
+        self.cache = TTLCache(max_entries, ttl)
+        self.static = self.load_hosts_file(hosts_file) if hosts_file else {}
+        self.latency = LatencyHistogram()
+
+    @staticmethod
+    def load_hosts_file(path):
+        """Parse an /etc/hosts style file into a name -> address mapping."""
+        mapping = {}
+        with open(path, "r") as f:
+            for line in f:
+                fields = line.split("#", 1)[0].split()
+                for name in fields[1:]:
+                    mapping.setdefault(name.lower(), fields[0])
+        return mapping
+
+    def known(self, host):
+        """Address of host from the hosts file, as an IP literal or from the cache; _MISSING otherwise."""
+        static = self.static.get(host.lower())
+        if static is not None:
+            return static
+        try:
+            ipaddress.ip_address(host)
+            return host
+        except ValueError:
+            pass
+        return self.cache.get(host, _MISSING)
+
+    def resolve(self, host):
+        """Return the IPv4 address for host, or None if it does not resolve."""
+        address = self.known(host)
+        if address is not _MISSING:
+            return address
+        started = time.perf_counter()
+        try:
+            address = socket.getaddrinfo(host, None, socket.AF_INET, socket.SOCK_STREAM)[0][4][0]
+        except (OSError, UnicodeError) as e:
+            logger.debug(f"DNS lookup failed for {host}: {str(e)}")
+            address = None
+        self.latency.record(time.perf_counter() - started)
+        self.cache.set(host, address)
+        return address
+
+    def lookups(self, targets):
+        """Yield (target, future) pairs, resolving up to `lookahead` targets in advance.
+
+        Hosts answered by the hosts file, IP literals and cache hits get an
+        already-completed future, so only real DNS traffic uses the pool.
+        """
+        window = deque()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for target in targets:
+                host = split_target(target)[0]
+                address = self.known(host)
+                if address is _MISSING:
+                    future = pool.submit(self.resolve, host)
+                else:
+                    future = Future()
+                    future.set_result(address)
+                window.append((target, future))
+                if len(window) >= self.lookahead:
+                    yield window.popleft()
+            while window:
+                yield window.popleft()
+
+class AsyncFTP:
+    """Minimal asyncio FTP client mirroring the ftplib calls used by the scanner."""
+
+    encoding = "utf-8"
+    maxline = 8192
+
+    def __init__(self, timeout=3, connect_timeout=None):
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout or timeout
+        self.reader = None
+        self.writer = None
+        self.welcome = None
+        # Set when the session is handed over to enrichment, which closes it
+        self.detached = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if not self.detached:
+            await self.close()
+
+    async def open(self, host, port=FTP_PORT):
+        """Open the control connection without reading anything from it."""
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port), self.connect_timeout
+        )
+
+    async def read_welcome(self):
+        self.welcome = await self.getresp()
+        return self.welcome
+
+    async def connect(self, host, port=FTP_PORT):
+        """Open the control connection and read the welcome banner."""
+        await self.open(host, port)
+        return await self.read_welcome()
+
+    def getwelcome(self):
+        return self.welcome
+
+    async def _readline(self, reader):
+        line = await asyncio.wait_for(reader.readline(), self.timeout)
+        if len(line) > self.maxline:
+            raise error_proto(f"got more than {self.maxline} bytes")
+        return line.decode(self.encoding, "replace")
+
+    async def getline(self):
+        line = await self._readline(self.reader)
+        if not line:
+            raise EOFError
+        return line.rstrip("\r\n")
+
+    async def getmultiline(self):
+        line = await self.getline()
+        if line[3:4] == "-":
+            code = line[:3]
+            while True:
+                nextline = await self.getline()
+                line = line + "\n" + nextline
+                if nextline[:3] == code and nextline[3:4] != "-":
+                    break
+        return line
+
+    async def getresp(self):
+        """Read a reply and raise the matching ftplib error for 4xx/5xx codes."""
+        resp = await self.getmultiline()
+        c = resp[:1]
+        if c in {"1", "2", "3"}:
+            return resp
+        if c == "4":
+            raise error_temp(resp)
+        if c == "5":
+            raise error_perm(resp)
+        raise error_proto(resp)
+
+    async def voidresp(self):
+        resp = await self.getresp()
+        if resp[:1] != "2":
+            raise error_reply(resp)
+        return resp
+
+    async def sendcmd(self, cmd):
+        self.writer.write((cmd + "\r\n").encode(self.encoding))
+        await self.writer.drain()
+        return await self.getresp()
+
+    async def voidcmd(self, cmd):
+        self.writer.write((cmd + "\r\n").encode(self.encoding))
+        await self.writer.drain()
+        return await self.voidresp()
+
+    async def login(self, user="anonymous", passwd="anonymous"):
+        resp = await self.sendcmd("USER " + user)
+        if resp[0] == "3":
+            resp = await self.sendcmd("PASS " + passwd)
+        if resp[0] == "3":
+            resp = await self.sendcmd("ACCT ")
+        if resp[0] != "2":
+            raise error_reply(resp)
+        return resp
+
+    async def pwd(self):
+        resp = await self.voidcmd("PWD")
+        if not resp.startswith("257"):
+            return ""
+        return parse257(resp)
+
+    async def system(self):
+        resp = await self.voidcmd("SYST")
+        return resp[4:]
+
+    async def dir(self, callback, limit=None):
+        """Run LIST over a passive data connection, feeding each line to callback.
+
+        With a limit, the data connection is closed after that many lines
+        and the server's transfer-aborted reply is accepted.
+        """
+        await self.voidcmd("TYPE A")
+        _, port = parse227(await self.sendcmd("PASV"))
+        host = self.writer.get_extra_info("peername")[0]
+        data_reader, data_writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port), self.timeout
+        )
+        try:
+            resp = await self.sendcmd("LIST")
+            if resp[0] == "2":
+                resp = await self.getresp()
+            if resp[0] != "1":
+                raise error_reply(resp)
+            received = 0
+            while limit is None or received < limit:
+                line = await self._readline(data_reader)
+                if not line:
+                    break
+                callback(line.rstrip("\r\n"))
+                received += 1
+        finally:
+            data_writer.close()
+        try:
+            return await self.voidresp()
+        except REPLY_ERRORS:
+            if limit is None or received < limit:
+                raise
+            return None  # cut off on purpose
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except Exception:
+                pass
+            self.writer = None
+
+class DeadlineExceeded(Exception):
+    """Raised inside a blocking probe once its per-host deadline has passed."""
+
+class ProbeGuard:
+    """Deadline bookkeeping for one blocking probe and the sockets it opened.
+
+    Besides the per-host deadline, the line currently being read may have
+    its own deadline (see line()), so a whole reply line is timed out the
+    way AsyncFTP does rather than each socket read.
+    """
+
+    def __init__(self, deadline=None):
+        self.deadline = deadline
+        self.line_deadline = None
+        self.line_expired = False
+        self.sockets = []
+        self.expired = False
+
+    def remaining(self, timeout):
+        """Cap a phase timeout by what is left of the deadline."""
+        if self.deadline is None:
+            return timeout
+        return max(0.001, min(timeout, self.deadline - time.monotonic()))
+
+    @contextmanager
+    def line(self, timeout):
+        """Raise TimeoutError unless the enclosed line read completes within timeout."""
+        self.line_deadline = time.monotonic() + timeout
+        try:
+            yield
+        except (OSError, EOFError):
+            if self.line_expired:
+                raise TimeoutError("timed out") from None
+            raise
+        finally:
+            self.line_deadline = None
+        if self.line_expired:
+            raise TimeoutError("timed out")
+
+    def add(self, sock):
+        self.sockets.append(sock)
+        if self.expired or self.line_expired:
+            self.shutdown()
+
+    def poll(self, now):
+        """Expire the probe, or just its current line, once its deadline has passed."""
+        if self.expired or self.line_expired:
+            return
+        if self.deadline is not None and self.deadline <= now:
+            self.expire()
+        elif self.line_deadline is not None and self.line_deadline <= now:
+            self.line_expired = True
+            self.shutdown()
+
+    def expire(self):
+        self.expired = True
+        self.shutdown()
+
+    def shutdown(self):
+        """Shut the probe's sockets down so any blocked read returns at once."""
+        for sock in self.sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def check(self):
+        if self.expired or (self.deadline is not None and time.monotonic() >= self.deadline):
+            raise DeadlineExceeded
+
+class DeadlineWatchdog:
+    """Background thread that expires blocking probes which outlive their deadline or line timeout.
+
+    Socket timeouts alone cannot bound a probe: a server that trickles a
+    byte just inside the timeout keeps each read alive indefinitely.
+    """
+
+    interval = 0.05
+
+    def __init__(self):
+        self._guards = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @contextmanager
+    def guard(self, seconds):
+        """Context manager yielding a ProbeGuard that expires after `seconds` (None = never)."""
+        probe = ProbeGuard(None if seconds is None else time.monotonic() + seconds)
+        with self._lock:
+            self._guards.add(probe)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="deadline-watchdog", daemon=True)
+                self._thread.start()
+        try:
+            yield probe
+        finally:
+            with self._lock:
+                self._guards.discard(probe)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            now = time.monotonic()
+            with self._lock:
+                probes = list(self._guards)
+            for probe in probes:
+                probe.poll(now)
+
+class GuardedFTP(FTP):
+    """ftplib client that registers its data connections with a ProbeGuard.
+
+    While `detached` is set, leaving a `with` block keeps the session open
+    so it can be handed over to the enrichment pool.
+    """
+
+    guard = None
+    detached = False
+
+    def __exit__(self, *args):
+        if not self.detached:
+            self.hang_up()
+
+    def hang_up(self):
+        """QUIT and close, whether or not the session is detached."""
+        super().__exit__(None, None, None)
+
+    def _line(self):
+        """Bound the next line read by self.timeout as a whole (see ProbeGuard.line)."""
+        return nullcontext() if self.guard is None else self.guard.line(self.timeout)
+
+    def getline(self):
+        with self._line():
+            return super().getline()
+
+    def ntransfercmd(self, cmd, rest=None):
+        conn, size = super().ntransfercmd(cmd, rest)
+        if self.guard is not None:
+            self.guard.add(conn)
+        return conn, size
+
+    def read_listing(self, limit):
+        """LIST, keeping the first `limit` lines and hanging up on the rest."""
+        lines = []
+        self.sendcmd("TYPE A")
+        with self.transfercmd("LIST") as conn, conn.makefile("r", encoding=self.encoding) as fp:
+            while len(lines) < limit:
+                with self._line():
+                    line = fp.readline()
+                if not line:
+                    break
+                lines.append(line.rstrip("\r\n"))
+        try:
+            self.voidresp()
+        except REPLY_ERRORS:
+            if len(lines) < limit:
+                raise  # a real failure, not the abort we caused
+        return lines
+
+def intern_text(text):
+    """Intern a repeated result text (error, banner, system type); None passes through."""
+    return None if text is None else sys.intern(text)
+
+class ScanRecord:
+    """Result of one host, in a fixed slotted layout.
+
+    A hit has no error and a failure has no server details. Error texts,
+    banners and the like repeat across hosts, so they are interned and
+    shared; the timestamp is a float (see time for the datetime).
+    """
+
+    __slots__ = ("host", "ip", "error", "banner", "current_dir", "system_type", "features", "files", "timestamp")
+
+    # Keys of the dict form written to the result files, for hits and failures
+    success_fields = ("host", "ip", "banner", "current_dir", "system_type", "features", "timestamp", "files")
+    failure_fields = ("host", "ip", "error", "timestamp")
+
+    def __init__(self, host, ip=None, error=None, banner=None, current_dir=None, system_type=None,
+                 features=None, files=(), timestamp=None):
+        self.host = host
+        self.ip = ip
+        self.error = intern_text(error)
+        self.banner = intern_text(banner)
+        self.current_dir = intern_text(current_dir)
+        self.system_type = intern_text(system_type)
+        self.features = features
+        self.files = files
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+    @property
+    def time(self):
+        return datetime.fromtimestamp(self.timestamp)
+
+    def replace(self, **changes):
+        """Return a copy with the given fields changed."""
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        return ScanRecord(**values)
+
+    def to_dict(self):
+        row = {name: getattr(self, name) for name in (self.success_fields if self.error is None else self.failure_fields)}
+        row["timestamp"] = self.time
+        return row
+
+    @classmethod
+    def from_dict(cls, row):
+        """Rebuild a record from to_dict() output, possibly round-tripped through JSON."""
+        values = {name: row[name] for name in cls.__slots__ if name in row}
+        timestamp = values.get("timestamp")
+        if isinstance(timestamp, str):
+            values["timestamp"] = datetime.fromisoformat(timestamp).timestamp()
+        elif isinstance(timestamp, datetime):
+            values["timestamp"] = timestamp.timestamp()
+        if values.get("files") is not None:
+            values["files"] = tuple(values["files"])
+        return cls(**values)
+
+class ResultSink:
+    """Base class for sinks that persist each probe result as soon as it finishes."""
+
+    mode = "w"
+    # Sinks whose rows later runs rely on (--resume, --store) only take
+    # results that are outcomes of the host (see is_outcome)
+    outcomes_only = False
+
+    def __init__(self, path):
+        self.path = path
+        self.file = sys.stdout if path == "-" else open(path, self.mode, newline="")
+
+    def write(self, record, ok):
+        raise NotImplementedError
+
+    def close(self):
+        if self.file is sys.stdout:
+            self.file.flush()
+        elif not self.file.closed:
+            self.file.close()
+
+class PlainSink(ResultSink):
+    """Plain list of vulnerable hosts, one per line (the classic vuln.txt)."""
+
+    def write(self, record, ok):
+        if ok:
+            self.file.write(f"{record.host}\n")
+            self.file.flush()
+
+class JSONLSink(ResultSink):
+    """One JSON object per probe result."""
+
+    def write(self, record, ok):
+        row = {"status": "success" if ok else "failed"}
+        row.update(record.to_dict())
+        self.file.write(json.dumps(row, default=str) + "\n")
+        self.file.flush()
+
+class CSVSink(ResultSink):
+    """One CSV row per probe result."""
+
+    fields = ["host", "ip", "status", "error", "system_type", "current_dir", "banner", "timestamp"]
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.writer = csv.DictWriter(self.file, fieldnames=self.fields, extrasaction="ignore")
+        self.writer.writeheader()
+        self.file.flush()
+
+    def write(self, record, ok):
+        row = {"status": "success" if ok else "failed"}
+        row.update(record.to_dict())
+        self.writer.writerow(row)
+        self.file.flush()
+
+class ScanJournal(JSONLSink):
+    """Append-only journal of completed hosts, replayed by --resume.
+
+    Completed hosts are indexed as a sorted array of 64-bit digests, so
+    skipping them costs 8 bytes per finished host and never requires the
+    inventory itself to be held in memory.
+    """
+
+    outcomes_only = True
+
+    mode = "a"
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.done = array("Q")
+        # A killed run may have left a torn last line; start on a fresh one
+        if self.file.tell() > 0:
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self.file.write("\n")
+
+    def replay(self):
+        """Yield (record, ok) for every journaled host and index it as done."""
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue  # torn write from an interrupted run
+                ok = row.pop("status") == "success"
+                self.done.append(host_digest(row["host"]))
+                yield ScanRecord.from_dict(row), ok
+        self.done = array("Q", sorted(self.done))
+
+    def is_done(self, host):
+        key = host_digest(host)
+        i = bisect_left(self.done, key)
+        return i < len(self.done) and self.done[i] == key
+
+class ResultStore:
+    """SQLite store of the latest result per host, kept across runs (--store).
+
+    Writing a host replaces its row but keeps the status it had in the
+    previous run, so the hosts whose anonymous access changed can be
+    listed at the end (changes()). Writes are committed about once a second.
+    """
+
+    outcomes_only = True
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY,
+            started REAL NOT NULL,
+            finished REAL,
+            journal TEXT
+        );
+        CREATE TABLE IF NOT EXISTS results (
+            host TEXT PRIMARY KEY,
+            ip TEXT,
+            ok INTEGER NOT NULL,
+            previous_ok INTEGER,
+            error TEXT,
+            record TEXT NOT NULL,
+            checked REAL NOT NULL,
+            run INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS results_checked ON results (checked);
+        CREATE INDEX IF NOT EXISTS results_run ON results (run);
+    """
+
+    upsert = """
+        INSERT INTO results (host, ip, ok, error, record, checked, run) VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (host) DO UPDATE SET
+            previous_ok = CASE WHEN results.run = excluded.run THEN results.previous_ok ELSE results.ok END,
+            ip = excluded.ip, ok = excluded.ok, error = excluded.error, record = excluded.record,
+            checked = excluded.checked, run = excluded.run
+    """
+
+    commit_interval = 1.0
+
+    def __init__(self, path, journal=None):
+        """Open the store and start a run; a --resume journal reopens the run it was started with."""
+        self.path = path
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(self.schema)
+        if "journal" not in [column[1] for column in self.db.execute("PRAGMA table_info(runs)")]:
+            self.db.execute("ALTER TABLE runs ADD COLUMN journal TEXT")  # stores from before --resume runs
+        journal = journal and os.path.abspath(journal)
+        row = journal and self.db.execute(
+            "SELECT id FROM runs WHERE journal = ? ORDER BY id DESC LIMIT 1", (journal,)
+        ).fetchone()
+        if row:
+            self.run = row[0]
+            self.db.execute("UPDATE runs SET finished = NULL WHERE id = ?", (self.run,))
+        else:
+            self.run = self.db.execute(
+                "INSERT INTO runs (started, journal) VALUES (?, ?)", (time.time(), journal)
+            ).lastrowid
+        self.first_run = self.db.execute("SELECT COUNT(*) FROM runs WHERE id < ?", (self.run,)).fetchone()[0] == 0
+        self.db.commit()
+        self._lock = threading.Lock()
+        self._committed = time.monotonic()
+        self._changes = None
+
+    def write(self, record, ok):
+        row = (record.host, record.ip, int(ok), record.error,
+               json.dumps(record.to_dict(), default=str), time.time(), self.run)
+        with self._lock:
+            self.db.execute(self.upsert, row)
+            if time.monotonic() - self._committed >= self.commit_interval:
+                self.db.commit()
+                self._committed = time.monotonic()
+
+    def lookup(self, host, ttl):
+        """Return (record, ok) if host was checked within the last ttl seconds, else None."""
+        with self._lock:
+            row = self.db.execute(
+                "SELECT ok, record FROM results WHERE host = ? AND checked >= ?", (host, time.time() - ttl)
+            ).fetchone()
+        if row is None:
+            return None
+        return ScanRecord.from_dict(json.loads(row[1])), bool(row[0])
+
+    def changes(self):
+        """Return (newly open, newly closed) hosts for this run.
+
+        Newly open hosts allow anonymous login now but did not when last
+        checked, or were never checked before (unless this is the store's
+        first run); newly closed ones allowed it last time and do not now.
+        The answer is kept when the store is closed, for the final report.
+        """
+        with self._lock:
+            if self._changes is not None:
+                return self._changes
+            self.db.commit()
+            opened = self.db.execute(
+                "SELECT host FROM results WHERE run = ? AND ok = 1 AND (previous_ok = 0 OR (previous_ok IS NULL AND ?))"
+                " ORDER BY host", (self.run, not self.first_run)
+            ).fetchall()
+            closed = self.db.execute(
+                "SELECT host, error FROM results WHERE run = ? AND ok = 0 AND previous_ok = 1 ORDER BY host", (self.run,)
+            ).fetchall()
+        return [host for host, in opened], closed
+
+    def close(self):
+        if self._changes is not None:
+            return
+        changes = self.changes()
+        with self._lock:
+            self.db.execute("UPDATE runs SET finished = ? WHERE id = ?", (time.time(), self.run))
+            self.db.commit()
+            self.db.close()
+            self._changes = changes
+
+class TraceWriter:
+    """Chrome trace-event file of per-probe spans (--trace), written as probes finish.
+
+    Each span becomes a complete ("X") event on the row of the worker
+    that ran it: a pool thread, an async lane or a worker process's
+    thread. Probes and enrichment jobs are outer spans with their phases
+    nested inside. The file uses the JSON array format, so a trace cut
+    short by a crash still loads in chrome://tracing or ui.perfetto.dev.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "w")
+        self.file.write("[\n")
+        self.origin = time.time()
+        self._ids = {}
+        self._first = True
+        self._lock = threading.Lock()
+
+    def _id(self, kind, label, pid=0):
+        """Numeric pid/tid for a process or worker label, announced by a metadata event."""
+        key = (kind, pid, label)
+        number = self._ids.get(key)
+        if number is None:
+            number = self._ids[key] = len(self._ids) + 1
+            self._event({"name": f"{kind}_name", "ph": "M", "pid": number if kind == "process" else pid,
+                         "tid": number, "args": {"name": label}})
+        return number
+
+    def _event(self, event):
+        self.file.write(("" if self._first else ",\n") + json.dumps(event))
+        self._first = False
+
+    def add(self, trace):
+        """Write the spans of a finished probe or enrichment trace."""
+        args = {"host": trace["host"]}
+        with self._lock:
+            pid = self._id("process", trace["process"])
+            for worker, name, start, duration in trace["spans"]:
+                self._event({"name": name, "cat": "probe", "ph": "X", "pid": pid,
+                             "tid": self._id("thread", worker, pid),
+                             "ts": round((start - self.origin) * 1e6), "dur": round(duration * 1e6), "args": args})
+
+    def close(self):
+        with self._lock:
+            if not self.file.closed:
+                self.file.write("\n]\n")
+                self.file.close()
+
+class DashboardView:
+    """Renderable that rebuilds a dashboard panel each time Live draws it."""
+
+    def __init__(self, build):
+        self.build = build
+
+    def __rich__(self):
+        return self.build()
+
 class FTPDestroyer:
-    def __init__(self, timeout=3, max_workers=20, output_file="vuln.txt"):
+    def __init__(self, timeout=3, max_workers=20, output_file="vuln.txt", engine="thread",
+                 sinks=None, max_failed_records=1000, resolver=None, max_ip_results=100000,
+                 headless=False, controller=None, connect_timeout=None, banner_timeout=None,
+                 command_timeout=None, deadline=None, processes=1, coordinate=None,
+                 probe_depth="listing", listing_lines=5, enrich_workers=None,
+                 report_page_size=REPORT_PAGE_SIZE, report_gzip=False, tracer=None, prefixes=None):
         """Initialize FTP Destroyer with custom settings."""
         self.timeout = timeout
+        # Per-phase timeouts default to --timeout; deadline bounds a whole host
+        # (by default, one full timeout for connect, banner and three replies;
+        # 0 disables it)
+        self.connect_timeout = connect_timeout or timeout
+        self.banner_timeout = banner_timeout or timeout
+        self.command_timeout = command_timeout or timeout
+        if deadline is None:
+            deadline = self.connect_timeout + self.banner_timeout + 3 * self.command_timeout
+        self.deadline = deadline or None
+        self.watchdog = DeadlineWatchdog()
+        # Details of a hit (PWD/SYST/FEAT, listing) are gathered by a small
+        # separate pool so probe slots are freed as soon as login succeeds;
+        # when its backlog is full, hits are recorded without details.
+        self.probe_depth = probe_depth
+        self.listing_lines = listing_lines
+        self.enrich_workers = enrich_workers or max(1, max_workers // 4)
+        self.enricher = ThreadPoolExecutor(max_workers=self.enrich_workers, thread_name_prefix="enrich")
+        self._enrich_slots = threading.BoundedSemaphore(4 * self.enrich_workers)
         self.max_workers = max_workers
         self.output_file = output_file
+        self.engine = engine
+        self.processes = processes
+        self.coordinate = coordinate
+        self.headless = headless
+        self.completed = 0
+        self._scan_started = time.time()
+        # Every result is streamed to the sinks; only hits, per-category
+        # failure counts and a bounded sample of failures are kept in memory
+        # for the report and tables.
+        self.sinks = ([PlainSink(output_file)] if output_file else []) + list(sinks or [])
+        self.max_failed_records = max_failed_records
+        self._result_lock = threading.Lock()
         self.successful_targets = []
         self.failed_targets = []
+        self.failure_categories = Counter()
+        self.report_page_size = report_page_size
+        self.report_gzip = report_gzip
+        # With tracing on, each probe's trace dict also collects spans for
+        # the TraceWriter; async probes get the lowest free lane as their row
+        self.tracer = tracer
+        self.tracing = tracer is not None
+        self.trace_process = f"{socket.gethostname()} pid {os.getpid()}"
+        self._lanes = 0
+        self._free_lanes = []
+        self.journal = None
+        self.store = None
+        self.skip_fresh = None
+        # Hosts merged from a journal or the store instead of being probed;
+        # done_indexes answer is_done(host) for the targets to skip
+        self.resumed = 0
+        self.fresh = 0
+        self.done_indexes = []
+        # Each address is probed once; other hostnames that resolve to it
+        # wait on the in-flight probe or reuse its cached result.
+        self.resolver = resolver or Resolver()
+        self.phases = {name: LatencyHistogram() for name in PHASES}
+        self.phases["dns"] = self.resolver.latency
+        self.throughput = ThroughputMeter()
+        self.controller = controller or ConcurrencyController(max_workers, cooldown=timeout)
+        # Optional PrefixHealth; hosts in prefixes that stay silent are skipped
+        self.prefixes = prefixes
+        self.ip_results = OutcomeCache(max_ip_results)
+        self._ip_waiters = {}
+        # Connects that failed for lack of local resources even after back-off
+        self.local_errors = 0
         self.current_target = None
         self.stats = {
             "total": 0,
@@ -69,12 +1478,13 @@ class FTPDestroyer:
             "avg_speed": 0,
             "remaining_time": 0
         }
-        self.event_log = []
         self.max_event_log = 8
-        self.layout = self._create_layout()
+        self.event_log = deque(maxlen=self.max_event_log)
+        self.layout = None
 
     def _create_layout(self):
         """Create the main layout for the display."""
+        from rich.layout import Layout
         layout = Layout()
         
         # Split layout vertically
@@ -100,6 +1510,9 @@ class FTPDestroyer:
 
     def generate_banner(self):
         """Generate the application banner."""
+        from rich.align import Align
+        from rich.box import HEAVY
+        from rich.panel import Panel
         banner_text = """
 ╭══════════════════════════════════════════════════════════╮
 │        [bold cyan]FTP LOGIN DESTROYER[/bold cyan] [bold magenta]2.0[/bold magenta]            │
@@ -117,6 +1530,9 @@ class FTPDestroyer:
 
     def generate_stats_panel(self):
         """Generate the statistics panel with improved layout."""
+        from rich.box import ROUNDED
+        from rich.panel import Panel
+        from rich.table import Table
         stats_table = Table(
             show_header=True,
             header_style="bold cyan",
@@ -138,10 +1554,18 @@ class FTPDestroyer:
             success_rate = (self.stats['success'] / self.stats['total']) * 100
             stats_table.add_row("Success Rate", f"[yellow]{success_rate:.1f}%[/yellow]")
         
-        if self.stats['current_speed'] > 0:
+        controller = self.controller
+        limit = f"{int(controller.limit)}" + (f" (max {controller.maximum})" if controller.adaptive else "")
+        stats_table.add_row("Concurrency", f"[magenta]{controller.in_flight} / {limit}[/magenta]")
+
+        if self.stats['avg_speed'] > 0:
             stats_table.add_row("Current Speed", f"[magenta]{self.stats['current_speed']:.1f} t/s[/magenta]")
             stats_table.add_row("Average Speed", f"[magenta]{self.stats['avg_speed']:.1f} t/s[/magenta]")
 
+        # p50/p95/p99 per phase, in milliseconds
+        for name, p50, p95, p99 in self.phase_percentiles():
+            stats_table.add_row(f"{name} p50/95/99", f"[blue]{p50:.0f}/{p95:.0f}/{p99:.0f} ms[/blue]")
+
         return Panel(
             stats_table,
             title="[bold cyan]Scan Statistics[/bold cyan]",
@@ -150,8 +1574,18 @@ class FTPDestroyer:
             padding=(1, 2)
         )
 
+    def phase_percentiles(self):
+        """Yield (phase, p50, p95, p99) in milliseconds for phases that have samples."""
+        for name in PHASES:
+            histogram = self.phases[name]
+            if histogram.count:
+                yield (name, *(histogram.percentile(p) * 1000 for p in (50, 95, 99)))
+
     def generate_current_target_panel(self):
         """Generate the current target information panel with improved layout."""
+        from rich.box import ROUNDED
+        from rich.panel import Panel
+        from rich.table import Table
         if not self.current_target:
             content = "[yellow]Initializing scan...[/yellow]"
         else:
@@ -159,7 +1593,7 @@ class FTPDestroyer:
             content.add_column(style="bold cyan", justify="left")
             content.add_column(style="yellow")
             content.add_row("Target:", self.current_target)
-            content.add_row("Port:", "21")
+            content.add_row("Port:", str(split_target(self.current_target)[1]))
             content.add_row("Status:", "[bold green]Scanning...[/bold green]")
 
         return Panel(
@@ -172,6 +1606,9 @@ class FTPDestroyer:
 
     def generate_event_log_panel(self):
         """Generate a live event log panel of recent scan results."""
+        from rich.box import ROUNDED
+        from rich.panel import Panel
+        from rich.table import Table
         table = Table(
             show_header=True,
             header_style="bold magenta",
@@ -186,8 +1623,9 @@ class FTPDestroyer:
         if not self.event_log:
             table.add_row("-", "-", "[yellow]waiting...[/yellow]")
         else:
-            for event in reversed(self.event_log[-self.max_event_log:]):
-                table.add_row(event["time"], event["host"], event["result"]) 
+            for when, host, ok, message in reversed(list(self.event_log)):
+                result = f"[green]OK[/green] {message}" if ok else f"[red]FAIL[/red] {message}"
+                table.add_row(time.strftime("%H:%M:%S", time.localtime(when)), host, result)
 
         return Panel(
             table,
@@ -198,118 +1636,596 @@ class FTPDestroyer:
         )
 
     def _log_event(self, host, ok, message=""):
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        result_text = f"[green]OK[/green] {message}" if ok else f"[red]FAIL[/red] {message}"
-        self.event_log.append({
-            "time": timestamp,
-            "host": host,
-            "result": result_text
-        })
-        if len(self.event_log) > self.max_event_log * 2:
-            self.event_log = self.event_log[-self.max_event_log:]
-
-    def is_port_open(self, hostname, port):
-        """Check if specified port is open."""
+        # Kept raw; markup is only built for the few events on screen
+        if not self.headless:
+            self.event_log.append((time.time(), host, ok, message))
+
+    def _emit(self, record, ok, source=None):
+        """Count a finished probe, keep it if needed and write it to every sink but its source."""
+        with self._result_lock:
+            if ok:
+                self.stats["success"] += 1
+                self.successful_targets.append(record)
+            else:
+                self.stats["failed"] += 1
+                self.failure_categories[error_category(record.error)] += 1
+                if len(self.failed_targets) < self.max_failed_records:
+                    self.failed_targets.append(record)
+            outcome = is_outcome(record)
+            for sink in self.sinks:
+                if sink is not source and (outcome or not sink.outcomes_only):
+                    sink.write(record, ok)
+            # Non-outcomes are not cached for other hostnames of the address either
+            if record.ip and outcome:
+                self.ip_results.set((record.ip, split_target(record.host)[1]), record)
+
+    def _record(self, record, ok, message):
+        """Emit a finished result and surface it in the event log."""
+        self._emit(record, ok)
+        self._log_event(record.host, ok, message)
+        return ok
+
+    def _record_success(self, server_info):
+        """Record a successful anonymous login."""
+        return self._record(server_info, True, "anonymous login allowed")
+
+    def _record_failure(self, hostname, error, message=None, ip=None):
+        """Record a failed probe."""
+        return self._record(ScanRecord(hostname, ip, error=error), False, message if message is not None else error)
+
+    def _record_alias(self, hostname, address, cached):
+        """Record the cached result of an address's probe for another hostname sharing it.
+
+        cached is the hit's record, or the error text of a failure.
+        """
+        if isinstance(cached, ScanRecord):
+            self._record(cached.replace(host=hostname), True, f"same address as {cached.host}")
+        else:
+            self._record_failure(hostname, cached, f"same address as {address}", ip=address)
+
+    def _route(self, hostname, address):
+        """Decide how a resolved host is handled: "probe", "done" or "queued".
+
+        "done" hosts are already recorded, as a DNS failure, as skipped in an
+        unreachable prefix or from an earlier probe of the same (address,
+        port); "queued" hosts are recorded
+        when the in-flight probe of their endpoint finishes (see _fan_out).
+        """
+        if address is None:
+            self._record_failure(hostname, DNS_FAILED, "DNS lookup failed")
+            return "done"
+
+        key = (address, split_target(hostname)[1])
+        with self._result_lock:
+            cached = self.ip_results.get(key)
+            if cached is None:
+                waiters = self._ip_waiters.get(key)
+                if waiters is not None:
+                    waiters.append(hostname)
+                    return "queued"
+                # Only hosts that would be probed count against an unreachable prefix
+                if self.prefixes is None or not self.prefixes.skip(ConcurrencyController.subnet(address)):
+                    self._ip_waiters[key] = []
+                    return "probe"
+        if cached is None:
+            self._record_failure(hostname, PREFIX_UNREACHABLE, "prefix unreachable", ip=address)
+        else:
+            self._record_alias(hostname, address, cached)
+        return "done"
+
+    def _fan_out(self, key):
+        """Record the finished probe of an (address, port) key for every queued hostname.
+
+        Returns the number of hosts completed, including the probed one.
+        """
+        with self._result_lock:
+            waiters = self._ip_waiters.pop(key, [])
+            cached = self.ip_results.get(key)
+        for hostname in waiters:
+            self._record_alias(hostname, key[0], cached)
+        return 1 + len(waiters)
+
+    def resume(self, journal):
+        """Merge a journal's finished results, then skip those hosts and journal new ones."""
+        for record, ok in journal.replay():
+            self._emit(record, ok)
+            self.resumed += 1
+        self.journal = journal
+        self.done_indexes.append(journal)
+        self.sinks.append(journal)
+        return self.resumed
+
+    def use_store(self, store, skip_fresh=None):
+        """Record every result in a ResultStore.
+
+        With skip_fresh (seconds), targets checked that recently are not
+        probed again; their stored results are merged as they come up
+        (see _is_done).
+        """
+        self.store = store
+        self.skip_fresh = skip_fresh
+        self.sinks.append(store)
+
+    def _is_done(self, target):
+        """True for a target finished by a resumed journal or merged fresh from the store."""
+        if any(index.is_done(target) for index in self.done_indexes):
+            return True
+        if self.skip_fresh is None:
+            return False
+        stored = self.store.lookup(target, self.skip_fresh)
+        if stored is None:
+            return False
+        self._emit(*stored, source=self.store)
+        self.resumed += 1
+        self.fresh += 1
+        return True
+
+    def close(self):
+        """Flush and close all result sinks and the trace."""
+        for sink in self.sinks:
+            sink.close()
+        if self.tracer is not None:
+            self.tracer.close()
+
+    @contextmanager
+    def _phase(self, name, trace=None):
+        """Time the enclosed block into the named phase histogram, even if it raises.
+
+        When a per-probe trace dict is given, the phase duration is also
+        stored in it and a timeout inside the block sets trace["timed_out"].
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        except (TimeoutError, asyncio.TimeoutError):
+            if trace is not None:
+                trace["timed_out"] = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self.phases[name].record(elapsed)
+            if trace is not None:
+                trace[name] = elapsed
+                spans = trace.get("spans")
+                if spans is not None:
+                    spans.append((trace["worker"], name, time.time() - elapsed, elapsed))
+
+    def _start_trace(self, host, worker=None):
+        """New per-probe trace dict; with tracing on it also collects spans.
+
+        worker labels the trace row and defaults to the current thread.
+        """
+        if not self.tracing:
+            return {}
+        return {"host": host, "process": self.trace_process, "worker": worker or threading.current_thread().name,
+                "spans": [], "started": time.time()}
+
+    def _end_trace(self, trace, name):
+        """Close a trace with its outer span (a probe or an enrichment job)."""
+        spans = trace.get("spans")
+        if spans is not None:
+            spans.append((trace["worker"], name, trace["started"], time.time() - trace["started"]))
+
+    def _take_lane(self):
+        """Lowest free trace row for an async unit of work; async work shares one thread."""
+        if self._free_lanes:
+            return heapq.heappop(self._free_lanes)
+        self._lanes += 1
+        return self._lanes
+
+    def _release_lane(self, lane):
+        heapq.heappush(self._free_lanes, lane)
+
+    def open_control_connection(self, hostname, port, timeout=None):
+        """Open the control socket once and hand it to ftplib without a second connect."""
+        timeout = timeout or self.connect_timeout
+        ftp = GuardedFTP(timeout=self.command_timeout)
+        ftp.host, ftp.port = hostname, port
+        ftp.sock = socket.create_connection((hostname, port), timeout)
+        ftp.af = ftp.sock.family
+        ftp.file = ftp.sock.makefile("r", encoding=ftp.encoding)
+        return ftp
+
+    def _connect_failed(self, hostname, port, address, error, trace):
+        """Record a failed connect, telling silent timeouts apart from fast refusals.
+
+        A timeout marks the trace "silent" for the PrefixHealth cache. Only
+        a refusal means the port is closed; the scanner's own resource
+        errors are recorded as such and kept out of the journal and store.
+        """
+        logger.debug(f"Port check failed for {hostname}: {str(error)}")
+        code = getattr(error, "errno", None)
+        if isinstance(error, (TimeoutError, asyncio.TimeoutError)):
+            if trace is not None:
+                trace["silent"] = True
+            return self._record_failure(hostname, NO_ANSWER.format(port=port), f"no answer on port {port}", ip=address)
+        if isinstance(error, ConnectionRefusedError):
+            return self._record_failure(hostname, PORT_CLOSED.format(port=port), f"port {port} closed", ip=address)
+        if code in UNREACHABLE_ERRNOS:
+            return self._record_failure(hostname, UNREACHABLE, "host unreachable", ip=address)
+        if code in LOCAL_ERRNOS:
+            if not self.local_errors:
+                logger.warning(f"Connects are failing locally ({error.strerror}); lower -w or raise ulimit -n")
+            self.local_errors += 1
+            return self._record_failure(hostname, f"{LOCAL_ERROR}: {error.strerror}", "scanner resource error", ip=address)
+        return self._record_failure(hostname, str(error), ip=address)
+
+    @staticmethod
+    def _local_retry(error, attempt):
+        """Back-off delay before retrying a connect that failed for lack of local resources, else None."""
+        if getattr(error, "errno", None) in LOCAL_ERRNOS and attempt < LOCAL_RETRIES:
+            return LOCAL_BACKOFF * 2 ** attempt
+        return None
+
+    def _set_phase_timeout(self, ftp, guard, timeout):
+        """Apply a phase timeout (capped by the host deadline) to the control and data sockets."""
+        ftp.timeout = guard.remaining(timeout)
+        ftp.sock.settimeout(ftp.timeout)
+
+    def test_ftp_credentials(self, hostname, username="anonymous", password="anonymous", address=None, trace=None):
+        """Test FTP connection and anonymous login over a single control connection.
+
+        Connect, banner and command reads each get their own timeout, capped
+        by what is left of the per-host deadline; if the deadline passes
+        mid-read the watchdog shuts the sockets down and the probe is
+        recorded as exceeding it.
+        """
+        self.current_target = hostname
+        host, port = split_target(hostname)
+        address = address or host
+
+        with self.watchdog.guard(self.deadline) as guard:
+            try:
+                return self._probe(hostname, port, address, username, password, trace, guard)
+            except DeadlineExceeded:
+                if trace is not None:
+                    trace["timed_out"] = True
+                return self._record_failure(hostname, DEADLINE_EXCEEDED, "deadline exceeded", ip=address)
+
+    def _probe(self, hostname, port, address, username, password, trace, guard):
+        """Blocking probe body for test_ftp_credentials; raises DeadlineExceeded once expired."""
+        attempt = 0
+        while True:
+            try:
+                with self._phase("connect", trace):
+                    ftp = self.open_control_connection(address, port, guard.remaining(self.connect_timeout))
+                break
+            except OSError as e:
+                guard.check()
+                delay = self._local_retry(e, attempt)
+                if delay is None:
+                    return self._connect_failed(hostname, port, address, e, trace)
+                time.sleep(guard.remaining(delay))
+                attempt += 1
+
+        ftp.guard = guard
+        guard.add(ftp.sock)
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.settimeout(self.timeout)
-                sock.connect((hostname, port))
+            with ftp:
+                try:
+                    self._set_phase_timeout(ftp, guard, self.banner_timeout)
+                    with self._phase("banner", trace):
+                        ftp.welcome = ftp.getresp()
+                except BANNER_ERRORS as e:
+                    guard.check()
+                    logger.debug(f"Banner read failed for {hostname}: {str(e)}")
+                    return self._record_failure(hostname, NO_BANNER, "no FTP banner", ip=address)
+
+                try:
+                    self._set_phase_timeout(ftp, guard, self.command_timeout)
+                    with self._phase("login", trace):
+                        ftp.login(username, password)
+                except LOGIN_ERRORS as e:
+                    return self._record_failure(hostname, f"{LOGIN_REFUSED}: {e}", "login refused", ip=address)
+
+                server_info = self._hit(hostname, address, ftp.getwelcome())
+                if self.probe_depth == "login":
+                    return self._record_success(server_info)
+                if trace is None:
+                    return self._enrich(ftp, server_info)
+                if not self._enrich_slots.acquire(blocking=False):
+                    logger.debug(f"Enrichment backlog full; recording {hostname} without details")
+                    return self._record_success(server_info)
+                ftp.detached = True
+                trace["enrichment"] = self.enricher.submit(self._deferred_enrich, ftp, server_info, port)
                 return True
+
         except Exception as e:
-            logger.debug(f"Port check failed for {hostname}: {str(e)}")
-            return False
+            guard.check()
+            return self._record_failure(hostname, str(e), ip=address)
+
+    def _hit(self, hostname, address, banner):
+        """Base record of a successful anonymous login; enrichment fills in the details."""
+        return ScanRecord(hostname, address, banner=banner)
 
-    def test_ftp_credentials(self, hostname, username="anonymous", password="anonymous"):
-        """Test FTP connection and anonymous login."""
+    def _enrich(self, ftp, server_info, trace=None):
+        """Gather details of a logged-in session, then close it and record the hit.
+
+        Enrichment gets its own deadline; errors only cost details, never
+        the hit itself.
+        """
+        with self.watchdog.guard(self.deadline) as guard:
+            ftp.guard = guard
+            guard.add(ftp.sock)
+            try:
+                self._set_phase_timeout(ftp, guard, self.command_timeout)
+                with self._phase("info", trace):
+                    server_info.current_dir = intern_text(ftp.pwd())
+                    server_info.system_type = intern_text(ftp.sendcmd("SYST")[4:])
+                    try:
+                        server_info.features = parse_features(ftp.sendcmd("FEAT"))
+                    except REPLY_ERRORS:
+                        pass  # FEAT is optional (RFC 2389)
+                if self.probe_depth == "listing":
+                    self._set_phase_timeout(ftp, guard, self.command_timeout)
+                    with self._phase("listing", trace):
+                        server_info.files = tuple(ftp.read_listing(self.listing_lines))
+            except Exception as e:
+                logger.debug(f"Enrichment of {server_info.host} stopped: {str(e)}")
+            finally:
+                ftp.hang_up()
+        return self._record_success(server_info)
+
+    def _deferred_enrich(self, ftp, server_info, port):
+        """Enrichment pool job; returns (hosts completed, trace) like a probe."""
+        trace = self._start_trace(server_info.host)
+        try:
+            self._enrich(ftp, server_info, trace)
+        finally:
+            self._enrich_slots.release()
+        self._end_trace(trace, "enrich")
+        return self._fan_out((server_info.ip, port)), trace
+
+    async def async_test_ftp_credentials(self, hostname, username="anonymous", password="anonymous", address=None, trace=None):
+        """Non-blocking equivalent of test_ftp_credentials for the async engine.
+
+        The whole probe runs under the per-host deadline and is cancelled
+        when it passes.
+        """
         self.current_target = hostname
-        
-        if not self.is_port_open(hostname, 21):
-            self.failed_targets.append({
-                "host": hostname,
-                "error": "Port 21 closed",
-                "timestamp": datetime.now()
-            })
-            self._log_event(hostname, False, "port 21 closed")
-            return False
+        host, port = split_target(hostname)
+        address = address or host
+
+        try:
+            return await asyncio.wait_for(
+                self._async_probe(hostname, port, address, username, password, trace), self.deadline
+            )
+        except asyncio.TimeoutError:
+            if trace is not None:
+                trace["timed_out"] = True
+            return self._record_failure(hostname, DEADLINE_EXCEEDED, "deadline exceeded", ip=address)
 
+    async def _async_probe(self, hostname, port, address, username, password, trace):
+        """Coroutine body for async_test_ftp_credentials."""
         try:
-            with FTP() as ftp:
-                ftp.connect(hostname, timeout=self.timeout)
-                ftp.login(username, password)
-                
-                # Get additional server info
-                server_info = {
-                    "host": hostname,
-                    "banner": ftp.getwelcome(),
-                    "current_dir": ftp.pwd(),
-                    "system_type": ftp.system(),
-                    "features": ftp.features() if hasattr(ftp, 'features') else None,
-                    "timestamp": datetime.now()
-                }
-                
-                # Try to get list of files
+            async with AsyncFTP(timeout=self.banner_timeout, connect_timeout=self.connect_timeout) as ftp:
+                attempt = 0
+                while True:
+                    try:
+                        with self._phase("connect", trace):
+                            await ftp.open(address, port)
+                        break
+                    except (OSError, asyncio.TimeoutError) as e:
+                        delay = self._local_retry(e, attempt)
+                        if delay is None:
+                            return self._connect_failed(hostname, port, address, e, trace)
+                        await asyncio.sleep(delay)
+                        attempt += 1
+
+                try:
+                    with self._phase("banner", trace):
+                        await ftp.read_welcome()
+                except BANNER_ERRORS as e:
+                    logger.debug(f"Banner read failed for {hostname}: {str(e)}")
+                    return self._record_failure(hostname, NO_BANNER, "no FTP banner", ip=address)
+
                 try:
-                    files = []
-                    ftp.dir(files.append)
-                    server_info["files"] = files[:5]  # Store first 5 files only
-                except:
-                    server_info["files"] = []
-                
-                self.successful_targets.append(server_info)
-                self._log_event(hostname, True, "anonymous login allowed")
+                    ftp.timeout = self.command_timeout
+                    with self._phase("login", trace):
+                        await ftp.login(username, password)
+                except LOGIN_ERRORS as e:
+                    return self._record_failure(hostname, f"{LOGIN_REFUSED}: {e}", "login refused", ip=address)
+
+                server_info = self._hit(hostname, address, ftp.getwelcome())
+                if self.probe_depth == "login":
+                    return self._record_success(server_info)
+                if trace is None:
+                    return await self._async_enrich(ftp, server_info)
+                if not self._enrich_slots.acquire(blocking=False):
+                    logger.debug(f"Enrichment backlog full; recording {hostname} without details")
+                    return self._record_success(server_info)
+                ftp.detached = True
+                trace["enrichment"] = asyncio.ensure_future(self._async_deferred_enrich(ftp, server_info, port))
                 return True
-                
+
         except Exception as e:
-            self.failed_targets.append({
-                "host": hostname,
-                "error": str(e),
-                "timestamp": datetime.now()
-            })
-            self._log_event(hostname, False, str(e))
-            return False
+            # Match the socket.timeout text ftplib surfaces in the thread engine
+            error = "timed out" if isinstance(e, asyncio.TimeoutError) else str(e)
+            return self._record_failure(hostname, error, ip=address)
+
+    async def _async_enrich(self, ftp, server_info, trace=None):
+        """Non-blocking equivalent of _enrich."""
+        try:
+            await asyncio.wait_for(self._async_details(ftp, server_info, trace), self.deadline)
+        except Exception as e:
+            logger.debug(f"Enrichment of {server_info.host} stopped: {str(e)}")
+        finally:
+            await ftp.close()
+        return self._record_success(server_info)
+
+    async def _async_details(self, ftp, server_info, trace=None):
+        with self._phase("info", trace):
+            server_info.current_dir = intern_text(await ftp.pwd())
+            server_info.system_type = intern_text(await ftp.system())
+            try:
+                server_info.features = parse_features(await ftp.sendcmd("FEAT"))
+            except REPLY_ERRORS:
+                pass  # FEAT is optional (RFC 2389)
+        if self.probe_depth == "listing":
+            files = []
+            with self._phase("listing", trace):
+                await ftp.dir(files.append, self.listing_lines)
+            server_info.files = tuple(files)
+
+    async def _async_deferred_enrich(self, ftp, server_info, port):
+        lane = self._take_lane() if self.tracing else None
+        trace = self._start_trace(server_info.host, f"async lane {lane}")
+        try:
+            await self._async_enrich(ftp, server_info, trace)
+        finally:
+            self._enrich_slots.release()
+            if lane is not None:
+                self._release_lane(lane)
+        self._end_trace(trace, "enrich")
+        return self._fan_out((server_info.ip, port)), trace
+
+    def _probe_address(self, hostname, address):
+        """Thread engine unit of work: probe one address and fan the result out.
+
+        Returns (hosts completed, per-probe trace) for the dispatcher.
+        """
+        trace = self._start_trace(hostname)
+        self.test_ftp_credentials(hostname, address=address, trace=trace)
+        self._end_trace(trace, "probe")
+        if "enrichment" in trace:
+            return 0, trace  # the host completes with its enrichment job
+        return self._fan_out((address, split_target(hostname)[1])), trace
+
+    def _finish_remote(self, hostname, address, result):
+        """Record a result shipped back by a shard worker and fan it out.
+
+        Runs on the ShardPool receiver thread; returns (hosts completed,
+        trace) like _probe_address.
+        """
+        record, ok, message, trace = result
+        for name in PHASES:
+            if name in trace:
+                self.phases[name].record(trace[name])
+        self.current_target = hostname
+        self._record(record, ok, message)
+        return self._fan_out((address, split_target(hostname)[1])), trace
+
+    def shard_settings(self):
+        """Keyword arguments for a ShardWorker that probes like this scanner."""
+        return {
+            "timeout": self.timeout,
+            "connect_timeout": self.connect_timeout,
+            "banner_timeout": self.banner_timeout,
+            "command_timeout": self.command_timeout,
+            "deadline": self.deadline or 0,
+            "max_workers": self.controller.maximum,
+            "engine": self.engine,
+            "probe_depth": self.probe_depth,
+            "listing_lines": self.listing_lines,
+            "enrich_workers": self.enrich_workers,
+            "tracing": self.tracing,
+        }
+
+    async def _async_probe_address(self, hostname, address):
+        """Async engine unit of work: probe one address and fan the result out."""
+        lane = self._take_lane() if self.tracing else None
+        trace = self._start_trace(hostname, f"async lane {lane}")
+        try:
+            await self.async_test_ftp_credentials(hostname, address=address, trace=trace)
+        finally:
+            if lane is not None:
+                self._release_lane(lane)
+        self._end_trace(trace, "probe")
+        if "enrichment" in trace:
+            return 0, trace
+        return self._fan_out((address, split_target(hostname)[1])), trace
+
+    def _finish_batch(self, done, pending, requeue, on_complete):
+        """Account for finished probes and enrichments; shared by _process_async and _dispatch.
+
+        pending maps each outstanding future or task to its subnet, or to
+        ENRICHMENT; a probe's deferred enrichment is added to it and handed
+        to requeue once done.
+        """
+        for future in done:
+            count, trace = future.result()
+            subnet = pending.pop(future)
+            if self.tracer is not None and trace:
+                self.tracer.add(trace)
+            if subnet is not ENRICHMENT:
+                self.controller.finish(subnet, trace)
+                if self.prefixes is not None:
+                    self.prefixes.finish(subnet, trace)
+                enrichment = trace.pop("enrichment", None)
+                if enrichment is not None:
+                    pending[enrichment] = ENRICHMENT
+                    enrichment.add_done_callback(requeue)
+            if count:
+                on_complete(count)
+
+    async def _process_async(self, targets, on_complete):
+        """Run the async engine with the controller deciding how many probes are in flight.
+
+        Finished tasks are handed back through a queue, so collecting one
+        result costs O(1) no matter how many probes are in flight, and the
+        target iterator is only advanced as fast as probes complete.
+        """
+        controller = self.controller
+        finished = asyncio.Queue()
+        pending = {}
+
+        def launch():
+            for (hostname, address), subnet in controller.ready():
+                task = asyncio.ensure_future(self._async_probe_address(hostname, address))
+                pending[task] = subnet
+                task.add_done_callback(finished.put_nowait)
+
+        async def collect():
+            tasks = [await finished.get()]
+            while not finished.empty():
+                tasks.append(finished.get_nowait())
+            self._finish_batch(tasks, pending, finished.put_nowait, on_complete)
+            launch()
+
+        for hostname, lookup in self.resolver.lookups(targets):
+            address = lookup.result() if lookup.done() else await asyncio.wrap_future(lookup)
+            route = self._route(hostname, address)
+            if route == "done":
+                on_complete()
+            elif route == "probe":
+                controller.submit((hostname, address), controller.subnet(address))
+                launch()
+                while controller.must_wait():
+                    await collect()
+
+        while pending:
+            await collect()
 
     def save_html_report(self):
-        """Generate and save HTML report."""
+        """Write the HTML report and return the path of its index page.
+
+        Sections are streamed to the file as they are generated. When there
+        are more hosts than fit on one page (or with report_gzip), per-host
+        detail goes to numbered pages in a directory next to the index.
+        """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         report_file = f"ftp_scan_report_{timestamp}.html"
-        
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>FTP Scan Report - {timestamp}</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; background-color: #f0f0f0; }}
-                .success {{ color: green; }}
-                .fail {{ color: red; }}
-                .container {{ margin: 20px 0; padding: 20px; border-radius: 5px; background-color: white; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }}
-                .stats {{ display: flex; justify-content: space-around; flex-wrap: wrap; }}
-                .stat-box {{ 
-                    padding: 20px;
-                    margin: 10px;
-                    min-width: 200px;
-                    border-radius: 5px;
-                    background-color: white;
-                    box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-                    text-align: center;
-                }}
-                .target-info {{
-                    border-left: 4px solid;
-                    padding: 10px;
-                    margin: 10px 0;
-                }}
-                .success-info {{ border-color: green; }}
-                .fail-info {{ border-color: red; }}
-                pre {{ background: #f5f5f5; padding: 10px; border-radius: 4px; }}
-            </style>
-        </head>
-        <body>
+        page_dir = f"ftp_scan_report_{timestamp}"
+        sections = (
+            ("successful", "Successful Targets", self.successful_targets, self._success_html),
+            ("failed", "Failed Targets", self.failed_targets, self._failure_html),
+        )
+        paged = self.report_gzip or any(len(records) > self.report_page_size for _, _, records, _ in sections)
+        if paged:
+            os.makedirs(page_dir, exist_ok=True)
+        # An interrupted run may not have started (resume replay) or finished scanning
+        now = datetime.now()
+        duration = (self.stats["end_time"] or now) - (self.stats["start_time"] or now)
+
+        with open(report_file, "w", encoding="utf-8") as f:
+            f.write(report_head(f"FTP Scan Report - {timestamp}"))
+            f.write(f"""
             <div class="container">
                 <h1>FTP Login Destroyer Scan Report</h1>
-                <p>Scan Time: {datetime.now()}</p>
-                <p>Duration: {self.stats['end_time'] - self.stats['start_time']}</p>
+                <p>Scan Time: {now}</p>
+                <p>Duration: {duration}</p>
             </div>
-            
+
             <div class="stats">
                 <div class="stat-box">
                     <h3>Total Targets</h3>
@@ -325,55 +2241,231 @@ class FTPDestroyer:
                 </div>
                 <div class="stat-box">
                     <h3>Success Rate</h3>
-                    <p>{(self.stats['success']/self.stats['total'])*100:.2f}%</p>
+                    <p>{(self.stats['success']/max(self.stats['total'], 1))*100:.2f}%</p>
                 </div>
             </div>
-            
+            """)
+            f.write(self._changes_html())
+            f.write(self._failure_summary_html())
+            f.write("""
             <div class="container">
-                <h2>Successful Targets</h2>
-                {''.join([f"""
+                <h2>Phase Latency</h2>
+                <table>
+                    <tr><th>Phase</th><th>Samples</th><th>p50 (ms)</th><th>p95 (ms)</th><th>p99 (ms)</th><th>Max (ms)</th></tr>
+            """)
+            for name, p50, p95, p99 in self.phase_percentiles():
+                f.write(f"<tr><td>{name}</td><td>{self.phases[name].count}</td><td>{p50:.1f}</td>"
+                        f"<td>{p95:.1f}</td><td>{p99:.1f}</td><td>{self.phases[name].max * 1000:.1f}</td></tr>\n")
+            f.write("</table></div>\n")
+
+            for name, title, records, render in sections:
+                f.write(f'<div class="container">\n<h2>{title}</h2>\n')
+                if name == "failed" and len(records) < self.stats["failed"]:
+                    f.write(f"<p>Showing the first {len(records)} of {self.stats['failed']} failures "
+                            f"(the result files hold them all).</p>\n")
+                if paged and records:
+                    pages = self._write_pages(page_dir, name, title, records, render)
+                    f.write(f"<p>{len(records)} hosts on {len(pages)} pages:</p>\n<ul>\n")
+                    for number, page in enumerate(pages):
+                        first = number * self.report_page_size + 1
+                        last = min(first + self.report_page_size - 1, len(records))
+                        f.write(f'<li><a href="{page_dir}/{page}">Page {number + 1}</a> (hosts {first}-{last})</li>\n')
+                    f.write("</ul>\n")
+                elif not paged:
+                    for record in records:
+                        f.write(render(record))
+                f.write("</div>\n")
+            f.write("</body>\n</html>\n")
+
+        return report_file
+
+    def _write_pages(self, directory, name, title, records, render):
+        """Write records as numbered pages of report_page_size hosts; return the page file names."""
+        suffix = ".html.gz" if self.report_gzip else ".html"
+        count = max(1, math.ceil(len(records) / self.report_page_size))
+        names = [f"{name}-{number:04d}{suffix}" for number in range(1, count + 1)]
+        for number, page in enumerate(names):
+            links = [f'<a href="../{directory}.html">Index</a>']
+            if number > 0:
+                links.append(f'<a href="{names[number - 1]}">Previous</a>')
+            if number + 1 < count:
+                links.append(f'<a href="{names[number + 1]}">Next</a>')
+            nav = f'<p>{" | ".join(links)}</p>\n'
+            start = number * self.report_page_size
+            with (gzip.open if self.report_gzip else open)(os.path.join(directory, page), "wt", encoding="utf-8") as f:
+                f.write(report_head(f"{title} - page {number + 1} of {count}"))
+                f.write(f'<div class="container">\n<h2>{title} - page {number + 1} of {count}</h2>\n{nav}')
+                for record in records[start:start + self.report_page_size]:
+                    f.write(render(record))
+                f.write(f"{nav}</div>\n</body>\n</html>\n")
+        return names
+
+    @staticmethod
+    def _success_html(target):
+        """Report entry of one successful host."""
+        files = target.files
+        sample = f"<div><strong>Sample Files:</strong><ul>{''.join(f'<li>{escape(str(file))}</li>' for file in files)}</ul></div>" if files else ""
+        return f"""
                 <div class="target-info success-info">
-                    <h3>{target['host']}</h3>
-                    <pre>{target['banner']}</pre>
-                    <p><strong>System Type:</strong> {target['system_type']}</p>
-                    <p><strong>Initial Directory:</strong> {target['current_dir']}</p>
-                    <p><strong>Timestamp:</strong> {target['timestamp']}</p>
-                    {'<div><strong>Sample Files:</strong><ul>' + ''.join([f'<li>{file}</li>' for file in target['files']]) + '</ul></div>' if target['files'] else ''}
+                    <h3>{escape(target.host)}</h3>
+                    <pre>{escape(str(target.banner))}</pre>
+                    <p><strong>System Type:</strong> {escape(str(target.system_type))}</p>
+                    <p><strong>Initial Directory:</strong> {escape(str(target.current_dir))}</p>
+                    <p><strong>Timestamp:</strong> {target.time}</p>
+                    {sample}
                 </div>
-                """ for target in self.successful_targets])}
-            </div>
-            
-            <div class="container">
-                <h2>Failed Targets</h2>
-                {''.join([f"""
+        """
+
+    @staticmethod
+    def _failure_html(target):
+        """Report entry of one failed host."""
+        return f"""
                 <div class="target-info fail-info">
-                    <h3>{target['host']}</h3>
-                    <p><strong>Error:</strong> {target['error']}</p>
-                    <p><strong>Timestamp:</strong> {target['timestamp']}</p>
+                    <h3>{escape(target.host)}</h3>
+                    <p><strong>Error:</strong> {escape(target.error)}</p>
+                    <p><strong>Timestamp:</strong> {target.time}</p>
                 </div>
-                """ for target in self.failed_targets])}
+        """
+
+    def _failure_summary_html(self):
+        """HTML table of failures by error category, counted over every failure."""
+        if not self.failure_categories:
+            return ""
+        failed = max(self.stats["failed"], 1)
+        rows = "".join(f"<tr><td>{escape(category)}</td><td>{count}</td><td>{count / failed * 100:.1f}%</td></tr>"
+                       for category, count in self.failure_categories.most_common())
+        return f"""
+            <div class="container">
+                <h2>Failures by Category</h2>
+                <table>
+                    <tr><th>Category</th><th>Hosts</th><th>Share</th></tr>
+                    {rows}
+                </table>
             </div>
-        </body>
-        </html>
         """
-        
-        with open(report_file, "w") as f:
-            f.write(html_content)
 
-        # Save vulnerable targets to the output file
-        with open(self.output_file, "w") as f:
-            for target in self.successful_targets:
-                f.write(f"{target['host']}\n")
+    def _changes_html(self):
+        """HTML section listing hosts whose anonymous access changed since the stored previous run."""
+        if self.store is None:
+            return ""
+        opened, closed = self.store.changes()
+        opened_items = "".join(f"<li class=\"success\">{escape(host)}</li>" for host in opened) or "<li>None</li>"
+        closed_items = "".join(f"<li class=\"fail\">{escape(host)} ({escape(str(error))})</li>" for host, error in closed) or "<li>None</li>"
+        return f"""
+            <div class="container">
+                <h2>Changes Since Last Run</h2>
+                <h3>Newly allowing anonymous login ({len(opened)})</h3>
+                <ul>{opened_items}</ul>
+                <h3>No longer allowing anonymous login ({len(closed)})</h3>
+                <ul>{closed_items}</ul>
+            </div>
+        """
 
-        return report_file
+    def print_changes(self):
+        """Print the hosts whose anonymous access changed since the stored previous run."""
+        if self.store is None:
+            return
+        from rich.box import ROUNDED
+        from rich.table import Table
+        opened, closed = self.store.changes()
+        table = Table(title="Changes Since Last Run", box=ROUNDED, header_style="bold magenta")
+        table.add_column("Host", style="cyan")
+        table.add_column("Change")
+        for host in opened:
+            table.add_row(host, "[green]now allows anonymous login[/green]")
+        for host, error in closed:
+            table.add_row(host, f"[red]no longer allows anonymous login[/red] ({error})")
+        if not opened and not closed:
+            table.add_row("-", "[yellow]no changes[/yellow]")
+        console.print(table)
 
-    def process_targets(self, targets):
-        """Process the list of targets with improved progress display."""
-        self.stats["total"] = len(targets)
-        self.stats["start_time"] = datetime.now()
-        start_time = time.time()
-        completed = 0
+    def _run_engine(self, targets, on_complete):
+        """Feed targets through the DNS stage into the selected probe engine."""
+        pool = None
+        if self.coordinate:
+            pool = CoordinatorPool(self.coordinate, self.shard_settings(), self._finish_remote)
+        elif self.processes > 1:
+            pool = ShardPool(self.processes, self.shard_settings(), self._finish_remote)
+        if pool is not None:
+            with pool:
+                self._dispatch(targets, on_complete, pool.submit, pool.flush)
+            return
+
+        if self.engine == "async":
+            asyncio.run(self._process_async(targets, on_complete))
+            return
+
+        # The pool is sized to the controller's ceiling
+        with ThreadPoolExecutor(max_workers=self.controller.maximum) as executor:
+            self._dispatch(targets, on_complete, partial(executor.submit, self._probe_address))
+
+    def _dispatch(self, targets, on_complete, submit, flush=None):
+        """Route resolved targets and start probes as the controller allows.
+
+        submit(hostname, address) returns a Future of (hosts completed,
+        trace) and finished futures come back through a queue. flush(), if
+        given, is called before blocking on results so batched submissions
+        are sent.
+        """
+        controller = self.controller
+        finished = queue.SimpleQueue()
+        pending = {}
+
+        def launch():
+            for (hostname, address), subnet in controller.ready():
+                future = submit(hostname, address)
+                pending[future] = subnet
+                future.add_done_callback(finished.put)
+
+        def collect():
+            if flush is not None:
+                flush()
+            futures = [finished.get()]
+            while not finished.empty():
+                futures.append(finished.get())
+            self._finish_batch(futures, pending, finished.put, on_complete)
+            launch()
+
+        for hostname, lookup in self.resolver.lookups(targets):
+            address = lookup.result()
+            route = self._route(hostname, address)
+            if route == "done":
+                on_complete()
+            elif route == "probe":
+                controller.submit((hostname, address), controller.subnet(address))
+                launch()
+                while controller.must_wait():
+                    collect()
+
+        while pending:
+            collect()
+
+    def _render_stats_panel(self):
+        """Refresh derived speed figures from the counters, then build the stats panel."""
+        elapsed = time.time() - self._scan_started
+        self.stats["current_speed"] = self.throughput.rate()
+        self.stats["avg_speed"] = self.completed / elapsed if elapsed > 0 else 0
+        return self.generate_stats_panel()
 
+    def _run_dashboard(self, targets, total, on_complete):
+        """Run the engine under the live dashboard.
+
+        The result loop only bumps counters; panels are DashboardView
+        renderables rebuilt by Live's own refresh thread at DASHBOARD_FPS,
+        so rendering cost no longer scales with the completion rate.
+        """
+        from rich.live import Live
+        from rich.progress import (
+            Progress,
+            SpinnerColumn,
+            BarColumn,
+            TextColumn,
+            TimeElapsedColumn,
+            TimeRemainingColumn,
+            MofNCompleteColumn
+        )
+
+        self.layout = self._create_layout()
         progress_cols = [
             SpinnerColumn(style="magenta"),
             TextColumn("[progress.description]{task.description}"),
@@ -403,62 +2495,78 @@ class FTPDestroyer:
         # Create a single Live display
         with Live(
             self.layout,
-            refresh_per_second=10,
+            refresh_per_second=DASHBOARD_FPS,
             screen=True,
-            console=console
-        ) as live:
+            console=console.get()
+        ):
             # Add the scanning task with enhanced display
             scan_task = progress.add_task(
                 "\n[bold cyan]╭──────────────── FTP Scan Progress ──────────────────╮\n"
                 "│                 Scanning targets...                 │\n"
                 "╰─────────────────────────────────────────────────────╯[/bold cyan]\n",
-                total=len(targets)
+                total=total,
+                completed=self.resumed
             )
             
-            # Update initial layout
+            # Panels are rebuilt from the live counters on every refresh
             self.layout["header"].update(self.generate_banner())
-            self.layout["stats"].update(self.generate_stats_panel())
-            self.layout["current"].update(self.generate_current_target_panel())
-            self.layout["events"].update(self.generate_event_log_panel())
-
-            # Start processing targets
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                futures = []
-                for target in targets:
-                    futures.append(executor.submit(self.test_ftp_credentials, target))
-
-                for future in as_completed(futures):
-                    completed += 1
-                    progress.advance(scan_task)
-                    
-                    # Update statistics
-                    elapsed = time.time() - start_time
-                    self.stats["current_speed"] = completed / elapsed if elapsed > 0 else 0
-                    self.stats["avg_speed"] = completed / elapsed if elapsed > 0 else 0
-                    
-                    # Update layout components
-                    self.layout["stats"].update(self.generate_stats_panel())
-                    self.layout["current"].update(self.generate_current_target_panel())
-                    self.layout["events"].update(self.generate_event_log_panel())
-                    
-                    # Refresh the display
-                    live.refresh()
+            self.layout["stats"].update(DashboardView(self._render_stats_panel))
+            self.layout["current"].update(DashboardView(self.generate_current_target_panel))
+            self.layout["events"].update(DashboardView(self.generate_event_log_panel))
+
+            def advance(count=1):
+                on_complete(count)
+                progress.advance(scan_task, count)
+
+            self._run_engine(targets, advance)
 
             # Complete the progress
             progress.stop()
 
+    def process_targets(self, targets, total=None):
+        """Process an iterable of targets with improved progress display.
+
+        Targets are consumed lazily, so a generator over a huge file or stdin
+        only ever holds a bounded window of in-flight probes in memory.
+        """
+        if total is None and hasattr(targets, "__len__"):
+            total = len(targets)
+        if self.done_indexes or self.skip_fresh is not None:
+            targets = (t for t in targets if not self._is_done(t))
+        self.stats["total"] = total or self.resumed
+        self.stats["start_time"] = datetime.now()
+        self._scan_started = time.time()
+        self.completed = completed = 0
+
+        def on_complete(count=1):
+            nonlocal completed
+            completed += count
+            self.completed = completed
+            self.throughput.add(count)
+            if total is None:
+                self.stats["total"] = self.resumed + completed
+
+        if self.headless:
+            self._run_engine(targets, on_complete)
+        else:
+            self._run_dashboard(targets, total, on_complete)
+
         self.stats["end_time"] = datetime.now()
-        self.stats["success"] = len(self.successful_targets)
-        self.stats["failed"] = len(self.failed_targets)
+        self.stats["total"] = self.resumed + completed
 
         # Print final detailed tables after live UI closes
+        if self.headless:
+            return
+        from rich.box import ROUNDED
+        from rich.table import Table
+
         if self.successful_targets:
             success_table = Table(title="Successful Targets", box=ROUNDED, header_style="bold green")
             success_table.add_column("Host", style="cyan")
             success_table.add_column("System", style="green")
             success_table.add_column("Dir", style="yellow")
             for t in self.successful_targets:
-                success_table.add_row(t["host"], str(t.get("system_type", "-")), str(t.get("current_dir", "-")))
+                success_table.add_row(t.host, str(t.system_type), str(t.current_dir))
             console.print(success_table)
 
         if self.failed_targets:
@@ -466,65 +2574,804 @@ class FTPDestroyer:
             fail_table.add_column("Host", style="cyan")
             fail_table.add_column("Error", style="red")
             for t in self.failed_targets:
-                fail_table.add_row(t["host"], str(t.get("error", "-")))
+                fail_table.add_row(t.host, t.error)
             console.print(fail_table)
 
+class ShardWorker(FTPDestroyer):
+    """Probe-only scanner run inside each --processes worker.
+
+    Routing, result sinks and the dashboard stay in the parent; a worker
+    probes the (job, hostname, address) batches it is sent with its own
+    engine and ships each result back with its phase trace.
+    """
+
+    def __init__(self, tracing=False, **settings):
+        super().__init__(output_file=None, headless=True, **settings)
+        # Spans ride back to the parent's TraceWriter in each shipped trace
+        self.tracing = tracing
+        self._results = {}
+        self.outbound = queue.SimpleQueue()
+
+    def _record(self, record, ok, message):
+        # Hostnames are unique per scan, so the probe's job can find its result
+        self._results[record.host] = (record, ok, message)
+        return ok
+
+    def _run_job(self, job, hostname, address):
+        trace = self._start_trace(hostname)
+        try:
+            self.test_ftp_credentials(hostname, address=address, trace=trace)
+            self._end_trace(trace, "probe")
+            # Results are shipped whole, so a worker waits for its enrichment
+            enrichment = trace.pop("enrichment", None)
+            if enrichment is not None:
+                self._merge_enrichment(trace, enrichment.result()[1])
+        except Exception as e:
+            self._record_failure(hostname, str(e), ip=address)
+        self.outbound.put((job, (*self._results.pop(hostname), trace)))
+
+    async def _async_run_job(self, job, hostname, address):
+        lane = self._take_lane() if self.tracing else None
+        trace = self._start_trace(hostname, f"async lane {lane}")
+        try:
+            await self.async_test_ftp_credentials(hostname, address=address, trace=trace)
+            if lane is not None:
+                self._release_lane(lane)
+                lane = None
+            self._end_trace(trace, "probe")
+            enrichment = trace.pop("enrichment", None)
+            if enrichment is not None:
+                self._merge_enrichment(trace, (await enrichment)[1])
+        except Exception as e:
+            self._record_failure(hostname, str(e), ip=address)
+        finally:
+            if lane is not None:
+                self._release_lane(lane)
+        self.outbound.put((job, (*self._results.pop(hostname), trace)))
+
+    @staticmethod
+    def _merge_enrichment(trace, enrichment_trace):
+        """Fold the enrichment's phase timings and spans into the shipped probe trace."""
+        for name in (*PHASES, "timed_out"):
+            if name in enrichment_trace:
+                trace[name] = enrichment_trace[name]
+        if "spans" in trace:
+            trace["spans"].extend(enrichment_trace["spans"])
+
+    def serve(self, receive, send):
+        """Probe job batches from receive() until it returns None; results go out through send().
+
+        A sender thread ships whatever results have piled up since its last
+        send as one batch, so batches grow with the completion rate.
+        """
+        sender = threading.Thread(target=self._ship, args=(send,), name="shard-sender")
+        sender.start()
+        if self.engine == "async":
+            asyncio.run(self._serve_async(receive))
+        else:
+            with ThreadPoolExecutor(max_workers=self.controller.maximum) as executor:
+                for batch in iter(receive, None):
+                    for job in batch:
+                        executor.submit(self._run_job, *job)
+        self.outbound.put(None)
+        sender.join()
+        send(None)
+
+    async def _serve_async(self, receive):
+        loop = asyncio.get_running_loop()
+        tasks = set()
+        with ThreadPoolExecutor(max_workers=1) as reader:
+            while (batch := await loop.run_in_executor(reader, receive)) is not None:
+                for job in batch:
+                    task = asyncio.ensure_future(self._async_run_job(*job))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.wait(tasks)
+
+    def _ship(self, send):
+        while True:
+            batch = [self.outbound.get()]
+            while not self.outbound.empty():
+                batch.append(self.outbound.get())
+            done = batch[-1] is None
+            if done:
+                batch.pop()
+            if batch:
+                send(batch)
+            if done:
+                return
+
+def run_shard(settings, inbox, results):
+    """Entry point of a --processes worker process."""
+    try:
+        ShardWorker(**settings).serve(inbox.get, results.put)
+    except KeyboardInterrupt:
+        pass
+
+class ShardPool:
+    """Spreads probes over worker processes, each running its own probe engine.
+
+    submit() returns a Future like an executor. Jobs go to the least loaded
+    worker in batches and results come back in batches over one shared
+    queue; a receiver thread completes each Future with
+    on_result(hostname, address, result). The jobs of a worker process
+    that dies go to the surviving ones; with none left they are recorded
+    as failed hosts.
+    """
+
+    batch_size = 256
+
+    def __init__(self, processes, settings, on_result):
+        context = multiprocessing.get_context("spawn")
+        self.on_result = on_result
+        self.results = context.Queue()
+        self.inboxes = [context.Queue() for _ in range(processes)]
+        self.workers = [
+            context.Process(target=run_shard, args=(settings, inbox, self.results), daemon=True)
+            for inbox in self.inboxes
+        ]
+        self.batches = [[] for _ in self.workers]
+        self.load = [0] * processes
+        self.alive = set(range(processes))
+        self.closing = False
+        self.jobs = {}
+        self.next_job = 0
+        self._lock = threading.Lock()
+        for worker in self.workers:
+            worker.start()
+        self._receiver = threading.Thread(target=self._receive, name="shard-receiver", daemon=True)
+        self._receiver.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            for worker in self.workers:
+                worker.terminate()
+
+    def submit(self, hostname, address):
+        future = Future()
+        with self._lock:
+            job = self.next_job
+            self.next_job += 1
+            self.jobs[job] = (future, None, hostname, address)
+            assigned = self._assign(job)
+        if not assigned:
+            self._fail(job, "No shard workers left")
+        return future
+
+    def _assign(self, job):
+        """Queue a job on the least loaded live worker; False if none is left. Call with _lock held."""
+        if not self.alive or self.closing:
+            return False
+        future, _, hostname, address = self.jobs[job]
+        index = min(self.alive, key=self.load.__getitem__)
+        self.load[index] += 1
+        self.jobs[job] = (future, index, hostname, address)
+        batch = self.batches[index]
+        batch.append((job, hostname, address))
+        if len(batch) >= self.batch_size:
+            self._send(index)
+        return True
+
+    def _fail(self, job, error):
+        """Complete a job that no worker can run as a failed host."""
+        future, _, hostname, address = self.jobs.pop(job)
+        result = (ScanRecord(hostname, address, error=error), False, error, {})
+        try:
+            future.set_result(self.on_result(hostname, address, result))
+        except Exception as e:
+            future.set_exception(e)
+
+    def flush(self):
+        """Send every partly filled batch."""
+        with self._lock:
+            for index, batch in enumerate(self.batches):
+                if batch:
+                    self._send(index)
+
+    def _send(self, index):
+        self.inboxes[index].put(self.batches[index])
+        self.batches[index] = []
+
+    def _receive(self):
+        stopped = 0
+        checked = time.monotonic()
+        while stopped < len(self.alive):
+            if time.monotonic() - checked >= 1:
+                self._check_workers()
+                checked = time.monotonic()
+            try:
+                batch = self.results.get(timeout=1)
+            except queue.Empty:
+                continue
+            if batch is None:
+                stopped += 1
+                continue
+            for job, result in batch:
+                with self._lock:
+                    entry = self.jobs.pop(job, None)
+                    if entry is not None:
+                        self.load[entry[1]] -= 1
+                if entry is None:
+                    continue  # already reassigned from a worker that died after running it
+                future, _, hostname, address = entry
+                try:
+                    future.set_result(self.on_result(hostname, address, result))
+                except Exception as e:
+                    future.set_exception(e)
+
+    def _check_workers(self):
+        """Move the jobs of any worker process that died to the live ones instead of hanging the scan."""
+        for index in list(self.alive):
+            worker = self.workers[index]
+            if worker.exitcode in (None, 0):
+                continue
+            error = f"Shard worker {worker.pid} exited with code {worker.exitcode}"
+            with self._lock:
+                self.alive.discard(index)
+                self.batches[index] = []
+                self.load[index] = 0
+                lost = [job for job, entry in self.jobs.items() if entry[1] == index]
+                failed = [job for job in lost if not self._assign(job)]
+                for other in self.alive:
+                    if self.batches[other]:
+                        self._send(other)
+            logger.warning(f"{error}; reassigning {len(lost) - len(failed)} jobs")
+            for job in failed:
+                self._fail(job, error)
+
+    def close(self):
+        """Stop the workers once their queued jobs are done."""
+        self.flush()
+        with self._lock:
+            self.closing = True
+            for index in self.alive:
+                self.inboxes[index].put(None)
+        self._receiver.join()
+        for worker in self.workers:
+            worker.join()
+
+def fit_fd_limit(workers):
+    """Raise the soft open-file limit toward the hard one for `workers`; return how many workers fit.
+
+    When even the hard limit is too low, -w is clamped with a warning
+    rather than letting connects fail with EMFILE.
+    """
+    try:
+        import resource
+    except ImportError:
+        return workers  # no RLIMIT_NOFILE (Windows)
+    needed = FDS_PER_WORKER * workers + FD_RESERVE
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY or soft >= needed:
+        return workers
+    target = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+        soft = target
+    except (ValueError, OSError):
+        pass
+    if soft >= needed:
+        return workers
+    fitted = max(1, (soft - FD_RESERVE) // FDS_PER_WORKER)
+    console.print(f"[yellow]Open-file limit {soft} only fits {fitted} workers; using -w {fitted} "
+                  f"(raise the hard limit, ulimit -Hn, for more)[/yellow]")
+    return fitted
+
+def endpoint(value):
+    """argparse type for HOST:PORT."""
+    host, _, port = value.rpartition(":")
+    if not port.isdigit():
+        raise argparse.ArgumentTypeError(f"expected HOST:PORT, got '{value}'")
+    return host.strip("[]") or "0.0.0.0", int(port)
+
+def duration(value):
+    """argparse type for a duration such as 3600, 90m, 12h or 7d; returns seconds."""
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+    number, unit = (value[:-1], value[-1].lower()) if value[-1:].lower() in units else (value, "s")
+    try:
+        return float(number) * units[unit]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a duration like 3600, 90m, 12h or 7d, got '{value}'")
+
+def send_message(stream, message):
+    """Write one newline-delimited JSON message of the coordinator protocol."""
+    stream.write(json.dumps(message, default=str).encode() + b"\n")
+    stream.flush()
+
+def enable_keepalive(sock):
+    """Let a silently vanished peer surface as a socket error within about a minute."""
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    for option, value in (("TCP_KEEPIDLE", 30), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3)):
+        if hasattr(socket, option):
+            sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+
+class RemoteWorker:
+    """Coordinator-side handle for one connected --worker node."""
+
+    def __init__(self, conn, stream, peer, hello):
+        self.conn = conn
+        self.stream = stream
+        self.name = f"{hello.get('name', 'worker')}@{peer[0]}:{peer[1]}"
+        self.segments = [ipaddress.ip_network(segment, strict=False) for segment in hello.get("segments") or []]
+        self.jobs = set()
+        self.batch = []
+        self._write_lock = threading.Lock()
+
+    def covers(self, address):
+        """True if this worker can reach address (workers without segments reach everything)."""
+        if not self.segments:
+            return True
+        ip = ipaddress.ip_address(address)
+        return any(ip in segment for segment in self.segments)
+
+    def send(self, message):
+        try:
+            with self._write_lock:
+                send_message(self.stream, message)
+        except OSError:
+            pass  # the reader thread notices the disconnect and reassigns the jobs
+
+    def close(self):
+        try:
+            self.conn.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.conn.close()
+
+class CoordinatorPool:
+    """Hands probe jobs to remote --worker nodes over TCP (--coordinate).
+
+    Same interface as ShardPool. Workers connect at any time and announce
+    the segments they can reach; each job goes in a batch to the least
+    loaded worker covering its address, or waits until one connects. Once
+    only such parked jobs are left and none of the connected workers has
+    taken them for park_grace seconds, they are recorded as failed. The
+    jobs of a worker that disconnects (or sends malformed results) are
+    reassigned. The protocol is newline-delimited JSON:
+
+        worker -> {"hello": {"name": ..., "segments": ["10.1.0.0/16"]}}
+        coordinator -> {"settings": {...}}, then {"jobs": [[job, host, ip], ...]}
+        worker -> {"results": [[job, [record, ok, message, trace]], ...]}
+        coordinator -> {"stop": true}
+    """
+
+    batch_size = 256
+    park_grace = 30.0
+
+    def __init__(self, bind, settings, on_result):
+        self.settings = settings
+        self.on_result = on_result
+        self.server = socket.create_server(bind)
+        self.workers = []
+        self.jobs = {}
+        self.unassigned = deque()
+        self.next_job = 0
+        self.closed = False
+        self._lock = threading.Lock()
+        logger.info(f"Coordinator listening on {bind[0]}:{bind[1]}; start workers with --worker HOST:{bind[1]}")
+        threading.Thread(target=self._accept, name="coordinator-accept", daemon=True).start()
+        threading.Thread(target=self._watch_parked, name="coordinator-parked", daemon=True).start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.closed = True
+            self.server.close()
+            for worker in list(self.workers):
+                worker.close()
+
+    def submit(self, hostname, address):
+        future = Future()
+        with self._lock:
+            job = self.next_job
+            self.next_job += 1
+            self.jobs[job] = [future, hostname, address, None]
+            ready = self._assign(job)
+        if ready:
+            self._send_batch(ready)
+        return future
+
+    def _assign(self, job):
+        """Queue a job on the least loaded eligible worker; returns it if its batch is full.
+
+        Must be called with the lock held.
+        """
+        entry = self.jobs[job]
+        worker = min((w for w in self.workers if w.covers(entry[2])), key=lambda w: len(w.jobs), default=None)
+        entry[3] = worker
+        if worker is None:
+            if not self.unassigned:
+                logger.warning(f"No connected worker covers {entry[2]}; jobs wait for one that does")
+            self.unassigned.append(job)
+            return None
+        worker.jobs.add(job)
+        worker.batch.append((job, entry[1], entry[2]))
+        return worker if len(worker.batch) >= self.batch_size else None
+
+    def _send_batch(self, worker):
+        with self._lock:
+            batch, worker.batch = worker.batch, []
+        if batch:
+            worker.send({"jobs": batch})
+
+    def flush(self):
+        """Send every partly filled batch."""
+        self._send_batches()
+
+    def _send_batches(self):
+        for worker in list(self.workers):
+            self._send_batch(worker)
+
+    def _watch_parked(self):
+        """Record parked jobs as failed once they have been all that is left for park_grace seconds.
+
+        Without any connected worker the jobs keep waiting, as documented.
+        """
+        stalled_since = None
+        while not self.closed:
+            time.sleep(0.5)
+            with self._lock:
+                if not (self.workers and self.unassigned and len(self.unassigned) == len(self.jobs)):
+                    stalled_since = None
+                    continue
+                stalled_since = stalled_since or time.monotonic()
+                if time.monotonic() - stalled_since < self.park_grace:
+                    continue
+                stalled, self.unassigned = list(self.unassigned), deque()
+                entries = [self.jobs.pop(job) for job in stalled]
+            stalled_since = None
+            self._fail(entries)
+
+    def _fail(self, entries):
+        """Record the jobs of (future, hostname, address, worker) entries as failed hosts."""
+        logger.warning(f"No worker covers {len(entries)} parked jobs; recording them as failed")
+        for future, hostname, address, _ in entries:
+            result = (ScanRecord(hostname, address, error=NO_WORKER), False, NO_WORKER, {})
+            try:
+                future.set_result(self.on_result(hostname, address, result))
+            except Exception as e:
+                future.set_exception(e)
+
+    def _accept(self):
+        while True:
+            try:
+                conn, peer = self.server.accept()
+            except OSError:
+                return  # server closed
+            threading.Thread(target=self._serve, args=(conn, peer), daemon=True).start()
+
+    def _serve(self, conn, peer):
+        """Register a worker, then read its results until it disconnects."""
+        enable_keepalive(conn)
+        stream = conn.makefile("rwb")
+        try:
+            hello = json.loads(stream.readline())["hello"]
+            worker = RemoteWorker(conn, stream, peer, hello)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Rejected worker connection from {peer[0]}: {str(e)}")
+            conn.close()
+            return
+        worker.send({"settings": self.settings})
+        with self._lock:
+            self.workers.append(worker)
+            waiting, self.unassigned = self.unassigned, deque()
+            for job in waiting:
+                self._assign(job)
+        logger.info(f"Worker {worker.name} joined ({', '.join(map(str, worker.segments)) or 'all segments'})")
+        self._send_batches()
+
+        try:
+            for line in worker.stream:
+                for job, result in json.loads(line).get("results", ()):
+                    record, ok, message, trace = result
+                    result = (ScanRecord.from_dict(record), bool(ok), str(message), dict(trace))
+                    with self._lock:
+                        entry = self.jobs.get(job)
+                        if entry is None or entry[3] is not worker:
+                            continue  # already reassigned
+                        del self.jobs[job]
+                        worker.jobs.discard(job)
+                    future = entry[0]
+                    try:
+                        future.set_result(self.on_result(entry[1], entry[2], result))
+                    except Exception as e:
+                        future.set_exception(e)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Worker {worker.name} connection error: {str(e)}")
+        except (TypeError, AttributeError, KeyError, IndexError) as e:
+            # Valid JSON in the wrong shape; the protocol is unauthenticated
+            logger.warning(f"Dropping worker {worker.name}: malformed results ({str(e)})")
+        self._lost(worker)
+
+    def _lost(self, worker):
+        """Drop a disconnected worker and reassign its unfinished jobs."""
+        with self._lock:
+            if worker not in self.workers:
+                return
+            self.workers.remove(worker)
+            lost = list(worker.jobs)
+            worker.jobs.clear()
+            worker.batch = []
+            for job in lost:
+                self._assign(job)
+        worker.close()
+        if lost:
+            logger.warning(f"Worker {worker.name} disconnected; reassigning {len(lost)} jobs")
+        self._send_batches()
+
+    def close(self):
+        """Stop accepting workers and tell connected ones to exit."""
+        self.closed = True
+        self.server.close()
+        with self._lock:
+            workers, self.workers = self.workers, []
+        for worker in workers:
+            worker.send({"stop": True})
+            worker.close()
+
+def run_worker(coordinator, segments=None):
+    """Serve probe jobs for a coordinator (--worker) until it sends stop or goes away."""
+    conn = socket.create_connection(coordinator)
+    enable_keepalive(conn)
+    stream = conn.makefile("rwb")
+    send_message(stream, {"hello": {"name": socket.gethostname(), "segments": segments or []}})
+    settings = json.loads(stream.readline())["settings"]
+    settings["max_workers"] = fit_fd_limit(settings["max_workers"])
+    console.print(f"[cyan]Connected to coordinator {coordinator[0]}:{coordinator[1]} ({settings['engine']} engine)[/cyan]")
+
+    def receive():
+        try:
+            line = stream.readline()
+        except OSError:
+            return None
+        return json.loads(line).get("jobs") if line else None
+
+    def send(batch):
+        if batch is None:
+            return
+        try:
+            send_message(stream, {"results": [(job, (record.to_dict(), *rest)) for job, (record, *rest) in batch]})
+        except OSError:
+            pass  # coordinator gone; it reassigns what we had
+
+    try:
+        ShardWorker(**settings).serve(receive, send)
+    finally:
+        conn.close()
+
 def main():
     """Main entry point of the script."""
     parser = argparse.ArgumentParser(
         description="[bold cyan]FTP Login Destroyer - Advanced FTP Scanner[/bold cyan]",
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
-    group = parser.add_mutually_exclusive_group(required=True)
-    group.add_argument("-t", "--target", help="Single target hostname or IP")
-    group.add_argument("-l", "--list", help="File containing target list (one per line)")
-    parser.add_argument("-w", "--workers", type=int, default=20, help="Number of concurrent workers (default: 20)")
-    parser.add_argument("-o", "--output", default="vuln.txt", help="Output file for vulnerable targets (default: vuln.txt)")
-    parser.add_argument("--timeout", type=int, default=3, help="Connection timeout in seconds (default: 3)")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("-t", "--target", help="Single target: hostname, IP, host:port, CIDR block or IPv4 range")
+    group.add_argument("-l", "--list", help="File containing targets (one per line, '-' for stdin)")
+    parser.add_argument("-w", "--workers", type=int, default=20,
+                        help="Number of concurrent workers; the ceiling when --adaptive is set (default: 20)")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="Adapt in-flight concurrency (AIMD) to timeout rate and connect latency")
+    parser.add_argument("--subnet-cap", type=int, help="Maximum probes in flight per /24 (IPv4) or /64 (IPv6) subnet")
+    parser.add_argument("--prefix-skip", type=int, default=0, metavar="N",
+                        help="After N silent connect timeouts in a row in a /24 (/64), skip its remaining hosts "
+                             "except for sample probes (default: 0, never skip)")
+    parser.add_argument("--prefix-sample", type=int, default=16, metavar="K",
+                        help="With --prefix-skip: probe one in K hosts of a skipped prefix (default: 16)")
+    parser.add_argument("-o", "--output",
+                        help="Output file for vulnerable targets (default: vuln.txt, none with --json)")
+    parser.add_argument("--timeout", type=float, default=3, help="Default timeout in seconds for every phase (default: 3)")
+    parser.add_argument("--connect-timeout", type=float, help="TCP connect timeout in seconds (default: --timeout)")
+    parser.add_argument("--banner-timeout", type=float,
+                        help="Timeout for each whole line of the FTP banner, however slowly it trickles in (default: --timeout)")
+    parser.add_argument("--command-timeout", type=float,
+                        help="Timeout for each whole line of a command reply or listing (default: --timeout)")
+    parser.add_argument("--deadline", type=float,
+                        help="Hard limit in seconds on the total time spent on one host "
+                             "(default: connect + banner + 3 x command timeout; 0 for none)")
+    parser.add_argument("--probe-depth", choices=PROBE_DEPTHS, default="listing",
+                        help="After a successful login: stop ('login'), add PWD/SYST/FEAT ('info') "
+                             "or also sample the listing ('listing') (default: listing)")
+    parser.add_argument("--listing-lines", type=int, default=5,
+                        help="Directory listing lines to read before hanging up (default: 5)")
+    parser.add_argument("--enrich-workers", type=int,
+                        help="Concurrent sessions gathering hit details, apart from the probes (default: -w / 4)")
+    parser.add_argument("--jsonl", help="Stream every result to this JSON Lines file ('-' for stdout)")
+    parser.add_argument("--csv", help="Stream every result to this CSV file")
+    parser.add_argument("--resume", metavar="JOURNAL",
+                        help="Append completed hosts to JOURNAL and skip hosts it already lists")
+    parser.add_argument("--store", metavar="DB",
+                        help="SQLite result store kept across runs; enables the changes-since-last-run report")
+    parser.add_argument("--skip-fresh", type=duration, metavar="TTL",
+                        help="With --store: skip hosts checked within TTL (e.g. 7d, 12h) and reuse their stored result")
+    parser.add_argument("--failure-sample", type=int, default=1000, metavar="N",
+                        help="Failed hosts kept for the report and final table; every failure is still "
+                             "counted by category and written to the result files (default: 1000)")
+    parser.add_argument("--report-page-size", type=int, default=REPORT_PAGE_SIZE,
+                        help=f"Hosts per page of the HTML report's per-host detail (default: {REPORT_PAGE_SIZE})")
+    parser.add_argument("--report-gzip", action="store_true",
+                        help="Always page the per-host detail and gzip-compress the pages")
+    parser.add_argument("--dns-ttl", type=float, default=300,
+                        help="Seconds to cache DNS answers; hosts sharing an address are probed once (default: 300)")
+    parser.add_argument("--hosts-file", help="hosts(5)-style file of name-to-address overrides used before DNS")
+    parser.add_argument("--headless", action="store_true",
+                        help="Skip the live dashboard (for cron/CI); only the final summary is printed")
+    parser.add_argument("--json", action="store_true",
+                        help="Print each result as a JSON line on stdout and nothing else: no dashboard, "
+                             "summary or HTML report (implies --headless)")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="Worker processes to spread probes over; -w is then the total in flight (default: 1)")
+    parser.add_argument("--coordinate", type=endpoint, metavar="HOST:PORT",
+                        help="Listen on HOST:PORT and hand the targets out to --worker nodes")
+    parser.add_argument("--worker", type=endpoint, metavar="HOST:PORT",
+                        help="Run as a worker node for the coordinator at HOST:PORT")
+    parser.add_argument("--segment", action="append", metavar="CIDR",
+                        help="With --worker: a network this node can reach (repeatable; default: everything)")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="Write cProfile stats of the run to PATH (read with python -m pstats PATH)")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="Write per-probe phase spans to PATH in Chrome trace-event format")
+    parser.add_argument("--engine", choices=["thread", "async"], default="thread",
+                        help="Probe engine: 'thread' (ftplib thread pool) or 'async' (asyncio, pair with a large -w) (default: thread)")
     
     args = parser.parse_args()
+    if args.json:
+        args.headless = True
+        # stdout carries the results; messages and errors go to stderr
+        console.options["stderr"] = True
+    elif args.output is None:
+        args.output = "vuln.txt"
+    setup_logging(plain=args.json)
+    if not (args.worker or args.target or args.list):
+        parser.error("one of the arguments -t/--target -l/--list is required")
+    if args.report_page_size < 1:
+        parser.error("--report-page-size must be at least 1")
+    if args.prefix_skip < 0 or args.prefix_sample < 1:
+        parser.error("--prefix-skip must be at least 0 and --prefix-sample at least 1")
+    if args.skip_fresh is not None and not args.store:
+        parser.error("--skip-fresh requires --store")
+
+    with profiled(args.profile):
+        if not args.worker:
+            scan(args)
+            return
+        try:
+            run_worker(args.worker, args.segment)
+        except (OSError, ValueError, KeyError) as e:
+            console.print(f"[red]Worker stopped: {str(e)}[/red]")
+            sys.exit(1)
+        except KeyboardInterrupt:
+            sys.exit(1)
+
+@contextmanager
+def profiled(path):
+    """cProfile the enclosed block into path (pstats format); a no-op without a path.
+
+    On Python 3.12+ the profiler sees every thread of the process, so
+    pool threads, the dashboard refresh and socket waits all show up;
+    --processes workers are not included.
+    """
+    if not path:
+        yield
+        return
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        console.print(f"[cyan]Profile written to {path} (python -m pstats {path})[/cyan]")
 
+def scan(args):
+    """Run a scan (or coordinate one) as the command line asks."""
+    destroyer = None
     try:
+        # Streaming result sinks in addition to the plain output file
+        sinks = []
+        if args.json:
+            sinks.append(JSONLSink("-"))
+        if args.jsonl:
+            sinks.append(JSONLSink(args.jsonl))
+        if args.csv:
+            sinks.append(CSVSink(args.csv))
+
+        # Workers beyond the open-file limit would only fail with EMFILE;
+        # worker nodes check their own limit
+        if not args.coordinate:
+            args.workers = fit_fd_limit(args.workers)
+
         # Initialize FTP Destroyer
         destroyer = FTPDestroyer(
             timeout=args.timeout,
+            connect_timeout=args.connect_timeout,
+            banner_timeout=args.banner_timeout,
+            command_timeout=args.command_timeout,
+            deadline=args.deadline,
             max_workers=args.workers,
-            output_file=args.output
+            output_file=args.output,
+            engine=args.engine,
+            processes=args.processes,
+            coordinate=args.coordinate,
+            probe_depth=args.probe_depth,
+            listing_lines=args.listing_lines,
+            enrich_workers=args.enrich_workers,
+            max_failed_records=args.failure_sample,
+            report_page_size=args.report_page_size,
+            report_gzip=args.report_gzip,
+            tracer=TraceWriter(args.trace) if args.trace else None,
+            prefixes=PrefixHealth(args.prefix_skip, args.prefix_sample) if args.prefix_skip else None,
+            sinks=sinks,
+            resolver=Resolver(ttl=args.dns_ttl, hosts_file=args.hosts_file),
+            headless=args.headless,
+            controller=ConcurrencyController(
+                min(args.workers, 16) if args.adaptive else args.workers,
+                maximum=args.workers,
+                adaptive=args.adaptive,
+                subnet_cap=args.subnet_cap,
+                cooldown=args.connect_timeout or args.timeout
+            )
         )
 
-        # Process targets
-        targets = []
+        # Record results across runs, reusing recent ones; attached first so
+        # a resumed run continues its store run and re-saves replayed results
+        if args.store:
+            destroyer.use_store(ResultStore(args.store, journal=args.resume), args.skip_fresh)
+
+        # Merge results from an earlier, interrupted run
+        if args.resume:
+            resumed = destroyer.resume(ScanJournal(args.resume))
+            if resumed:
+                console.print(f"[cyan]Resuming: {resumed} hosts already completed in {args.resume}[/cyan]")
+
+        # Process targets (canonicalized, expanded and de-duplicated on the fly)
+        target_file = None
+        index = TargetIndex()
         if args.target:
-            targets = [args.target.strip()]
+            targets = index.iter([args.target])
         else:
             try:
-                with open(args.list, "r") as f:
-                    targets = [line.strip() for line in f if line.strip()]
+                target_file = sys.stdin if args.list == "-" else open(args.list, "r")
             except FileNotFoundError:
                 console.print(f"[red]Error: Target file '{args.list}' not found.[/red]")
                 sys.exit(1)
+            targets = index.iter(target_file)
 
-        # Remove any http:// or https:// prefixes
-        targets = [t.replace("http://", "").replace("https://", "").rstrip("/") for t in targets]
-        
-        # Initialize scan
-        with console.status("[bold green]Initializing scan...", spinner="dots"):
-            time.sleep(1)
-        
         # Process targets
         destroyer.process_targets(targets)
+        if target_file is not None and target_file is not sys.stdin:
+            target_file.close()
+        if destroyer.fresh:
+            console.print(f"[cyan]Skipped {destroyer.fresh} hosts checked within the last {args.skip_fresh:g}s[/cyan]")
         
+        destroyer.close()
+        if args.json:
+            return
+
         # Generate final report
         report_file = destroyer.save_html_report()
-        
+
         # Final summary
+        from rich.panel import Panel
         console.print("\n[bold green]Scan Complete![/bold green]")
         console.print(Panel(
             f"""
             [green]Total Targets Scanned: {destroyer.stats['total']}
             Successful Targets: {destroyer.stats['success']}
             Failed Targets: {destroyer.stats['failed']}
-            Success Rate: {(destroyer.stats['success']/destroyer.stats['total'])*100:.2f}%[/green]
+            Duplicate Targets Skipped: {index.duplicates}
+            Success Rate: {(destroyer.stats['success']/max(destroyer.stats['total'], 1))*100:.2f}%[/green]
             
             [cyan]HTML Report: {report_file}
             Vulnerable Targets: {args.output}[/cyan]
@@ -533,14 +3380,23 @@ def main():
             border_style="green",
             padding=(1, 2)
         ))
+        destroyer.print_changes()
 
     except KeyboardInterrupt:
         console.print("\n[red]Scan interrupted by user. Saving partial results...[/red]")
-        destroyer.save_html_report()
+        if destroyer is not None:
+            destroyer.close()
+            if not args.json:
+                destroyer.save_html_report()
+            if destroyer.journal is not None:
+                console.print(f"[cyan]Re-run with --resume {destroyer.journal.path} to continue.[/cyan]")
         sys.exit(1)
     except Exception as e:
         console.print(f"[red]An error occurred: {str(e)}[/red]")
         logger.exception("An unexpected error occurred")
+        if destroyer is not None:
+            # Commit pending store rows and mark the run finished
+            destroyer.close()
         sys.exit(1)
 
 if __name__ == "__main__":